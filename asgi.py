@@ -0,0 +1,76 @@
+"""
+ASGI entry point for running the Risk Management server under uvicorn.
+
+    pip install asgiref uvicorn
+    uvicorn asgi:app --host 0.0.0.0 --port 5000
+
+The Flask app is wrapped with asgiref's WsgiToAsgi adapter, changed to run each
+request on its own pool of ASGI_THREADS threads (default 8, like gunicorn.conf.py).
+Stock WsgiToAsgi runs every request on asgiref's one thread-sensitive thread, so a
+single slow IMAP fetch, SMTP send or report render would hold up every other
+request. With the pool, it ties up one thread while the rest keep serving.
+
+The folder watchers and digest scheduler start on the ASGI lifespan startup event.
+The digest job runs under an AsyncIOScheduler on uvicorn's event loop, so there is
+no separate scheduler thread. The job itself is synchronous, so the scheduler runs
+it in the loop's default executor, not on the loop and not on the request pool. With uvicorn --workers N only the first worker to take the
+services lock runs them; set BACKGROUND_SERVICES=false to skip them entirely.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from asgiref.sync import sync_to_async
+from asgiref.wsgi import WsgiToAsgi, WsgiToAsgiInstance
+
+from server import app as flask_app, start_background_services, stop_background_services
+
+BACKGROUND_SERVICES = os.getenv('BACKGROUND_SERVICES', 'true').strip().lower() not in ('0', 'false', 'no')
+
+ASGI_THREADS = int(os.getenv('ASGI_THREADS', '8'))
+
+_request_executor = ThreadPoolExecutor(max_workers=ASGI_THREADS, thread_name_prefix='asgi-request')
+
+
+class _PooledWsgiToAsgiInstance(WsgiToAsgiInstance):
+    # Same request handling as asgiref, but on the request pool instead of its single sync thread
+    run_wsgi_app = sync_to_async(WsgiToAsgiInstance.run_wsgi_app.__wrapped__,
+                                 thread_sensitive=False, executor=_request_executor)
+
+
+class PooledWsgiToAsgi(WsgiToAsgi):
+    """WsgiToAsgi that serves concurrent requests on a thread pool."""
+
+    async def __call__(self, scope, receive, send):
+        await _PooledWsgiToAsgiInstance(self.wsgi_application, self.duplicate_header_limit)(
+            scope, receive, send
+        )
+
+
+_wsgi_app = PooledWsgiToAsgi(flask_app)
+
+
+async def _lifespan(receive, send):
+    """Start the background services on startup and stop them on shutdown."""
+    services = None
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            if BACKGROUND_SERVICES:
+                # Created here so the scheduler binds to the server's running loop
+                services = start_background_services(AsyncIOScheduler())
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            if services is not None:
+                stop_background_services(*services)
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """Serve HTTP through the Flask app; handle lifespan events here."""
+    if scope['type'] == 'lifespan':
+        await _lifespan(receive, send)
+    else:
+        await _wsgi_app(scope, receive, send)
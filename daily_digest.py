@@ -3,9 +3,11 @@ Daily Risk Digest Email Generator
 Reads Risk Register and generates an HTML email summary.
 """
 
+import atexit
 import os
 import smtplib
 import io
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
@@ -28,6 +30,89 @@ SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
 EMAIL_FROM = os.getenv('EMAIL_FROM', 'mlaporte@iepwr.com')
 EMAIL_TO = os.getenv('EMAIL_TO', 'mlaporte@iepwr.com')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD', '')
+SMTP_TIMEOUT = 60  # seconds; bounds how long a stuck send can hold the shared connection
+
+# Shared SMTP connection, reused across digests and report emails and closed at exit.
+# smtplib connections are not thread-safe, so every use holds _smtp_lock.
+_smtp = None
+_smtp_account = None  # (server, port, user) the open connection is logged in as
+_smtp_lock = threading.Lock()
+
+
+def _close_smtp():
+    """Close the shared SMTP connection if one is open. Call with _smtp_lock held (or at exit)."""
+    global _smtp, _smtp_account
+    if _smtp is not None:
+        try:
+            _smtp.quit()
+        except (smtplib.SMTPException, OSError):
+            pass
+    _smtp = None
+    _smtp_account = None
+
+
+def _get_smtp(server, port, user, password):
+    """
+    Get the shared SMTP connection for an account, reconnecting if the server
+    dropped it or a different account is needed. Call with _smtp_lock held.
+    """
+    global _smtp, _smtp_account
+    account = (server, port, user)
+    if _smtp is not None and _smtp_account == account:
+        try:
+            _smtp.noop()
+            return _smtp
+        except (smtplib.SMTPException, OSError):
+            pass
+    _close_smtp()
+
+    connection = smtplib.SMTP(server, port, timeout=SMTP_TIMEOUT)
+    try:
+        connection.starttls()
+        connection.login(user, password)
+    except Exception:
+        connection.close()
+        raise
+    _smtp, _smtp_account = connection, account
+    return connection
+
+
+def _send_shared(server, port, from_addr, password, send):
+    """
+    Call send(connection) with the shared SMTP connection held, retrying once on a
+    fresh connection if the server closed the old one mid-send.
+    """
+    with _smtp_lock:
+        try:
+            send(_get_smtp(server, port, from_addr, password))
+        except smtplib.SMTPServerDisconnected:
+            _close_smtp()
+            send(_get_smtp(server, port, from_addr, password))
+
+
+def open_smtp(from_addr, password, server=SMTP_SERVER, port=SMTP_PORT):
+    """Open (or check) the shared SMTP connection ahead of a send, so the handshake can overlap other work."""
+    with _smtp_lock:
+        _get_smtp(server, port, from_addr, password)
+
+
+def send_smtp_message(msg, from_addr, password, to_addrs=None, server=SMTP_SERVER, port=SMTP_PORT):
+    """
+    Send an email.message.Message over the shared SMTP connection, skipping the
+    connect/STARTTLS/login handshake when a live connection already exists.
+    to_addrs defaults to the message's To/Cc/Bcc headers.
+    """
+    _send_shared(server, port, from_addr, password,
+                 lambda connection: connection.send_message(msg, from_addr, to_addrs))
+
+
+def send_smtp_bytes(message, from_addr, password, to_addrs, server=SMTP_SERVER, port=SMTP_PORT):
+    """Send an already-serialized message (bytes, CRLF line endings) over the shared SMTP connection."""
+    _send_shared(server, port, from_addr, password,
+                 lambda connection: connection.sendmail(from_addr, to_addrs, message))
+
+
+atexit.register(_close_smtp)
 
 
 def get_risk_register_path(project_code='HB'):
@@ -58,40 +143,24 @@ def read_risk_register(project_code='HB'):
     if not file_path.exists():
         return {'risks': [], 'tasks': [], 'milestones': []}
 
-    wb = openpyxl.load_workbook(file_path)
-
-    # Read risks
-    risks = []
-    risk_sheet = wb['Risk Register']
-    headers = [cell.value for cell in risk_sheet[1]]
-
-    for row_num in range(2, risk_sheet.max_row + 1):
-        row_data = {headers[i]: cell.value for i, cell in enumerate(risk_sheet[row_num]) if i < len(headers)}
-        if row_data.get('Risk ID'):
-            risks.append(row_data)
-
-    # Read tasks
-    tasks = []
-    task_sheet = wb['Tasks']
-    task_headers = [cell.value for cell in task_sheet[1]]
+    # Read-only mode streams rows instead of building every cell; must be closed
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
 
-    for row_num in range(2, task_sheet.max_row + 1):
-        row_data = {task_headers[i]: cell.value for i, cell in enumerate(task_sheet[row_num]) if i < len(task_headers)}
-        if row_data.get('Task ID'):
-            tasks.append(row_data)
+    def read_rows(sheet):
+        rows = sheet.iter_rows(values_only=True)
+        headers = next(rows, ())
+        return [dict(zip(headers, values)) for values in rows]
 
-    # Read milestones
-    milestones = []
-    if 'Milestones' in wb.sheetnames:
-        ms_sheet = wb['Milestones']
-        ms_headers = [cell.value for cell in ms_sheet[1]]
+    try:
+        risks = [r for r in read_rows(wb['Risk Register']) if r.get('Risk ID')]
+        tasks = [t for t in read_rows(wb['Tasks']) if t.get('Task ID')]
 
-        for row_num in range(2, ms_sheet.max_row + 1):
-            row_data = {ms_headers[i]: cell.value for i, cell in enumerate(ms_sheet[row_num]) if i < len(ms_headers)}
-            if row_data.get('Milestone ID') or row_data.get('Milestone'):
-                milestones.append(row_data)
+        milestones = []
+        if 'Milestones' in wb.sheetnames:
+            milestones = [m for m in read_rows(wb['Milestones']) if m.get('Milestone ID') or m.get('Milestone')]
+    finally:
+        wb.close()
 
-    wb.close()
     return {'risks': risks, 'tasks': tasks, 'milestones': milestones}
 
 
@@ -231,10 +300,17 @@ def get_portfolio_summary():
         tasks = data['tasks']
         milestones = data.get('milestones', [])
 
-        active_risks = len([r for r in risks if r.get('Status') in ['Open', 'Active', 'Escalated']])
-        critical_risks = len([r for r in risks if r.get('Impact') == 'Critical' and r.get('Status') != 'Closed'])
-        open_tasks = len([t for t in tasks if t.get('Status') not in ['Complete', 'Completed', 'Done']])
-        critical_milestones = len([m for m in milestones if m.get('Status') in ['Critical', 'At Risk']])
+        # Count active and critical risks in a single pass
+        active_risks = 0
+        critical_risks = 0
+        for r in risks:
+            status = r.get('Status')
+            if status in ('Open', 'Active', 'Escalated'):
+                active_risks += 1
+            if r.get('Impact') == 'Critical' and status != 'Closed':
+                critical_risks += 1
+        open_tasks = sum(1 for t in tasks if t.get('Status') not in ('Complete', 'Completed', 'Done'))
+        critical_milestones = sum(1 for m in milestones if m.get('Status') in ('Critical', 'At Risk'))
 
         # Determine health status
         if critical_risks > 0 or critical_milestones > 0:
@@ -537,10 +613,10 @@ def generate_portfolio_html(portfolio):
     if not portfolio:
         return ''
 
-    cards_html = ''
+    cards = []
     for proj in portfolio:
         health_class = proj['health'].lower().replace(' ', '-')
-        cards_html += f"""
+        cards.append(f"""
         <div class="project-card {health_class}">
             <div class="project-name">{proj['project']}</div>
             <div class="project-status {health_class}">{proj['health']}</div>
@@ -549,7 +625,8 @@ def generate_portfolio_html(portfolio):
                 {f" | {proj['critical_milestones']} critical" if proj['critical_milestones'] > 0 else ""}
             </div>
         </div>
-        """
+        """)
+    cards_html = ''.join(cards)
 
     return f"""
     <div class="portfolio-section">
@@ -566,14 +643,15 @@ def generate_critical_alerts_html(alerts):
     if not alerts:
         return ''
 
-    items_html = ''
+    items = []
     for alert in alerts[:5]:  # Limit to top 5 critical alerts
-        items_html += f"""
+        items.append(f"""
         <div class="critical-item">
             <div class="title">[{alert['project']}] {alert['type']}: {alert['title']}</div>
             <div class="description">{alert.get('description', '') or alert.get('mitigation', '')}</div>
         </div>
-        """
+        """)
+    items_html = ''.join(items)
 
     return f"""
     <div class="critical-banner">
@@ -588,7 +666,7 @@ def generate_attention_required_html(risks):
     if not risks:
         return '<p class="empty-message">No active risks requiring attention.</p>'
 
-    html = ''
+    parts = []
     for risk in risks:
         probability = risk.get('Probability', 'Unknown')
         priority_class = 'high' if probability == 'High' else 'medium' if probability == 'Medium' else ''
@@ -598,7 +676,7 @@ def generate_attention_required_html(risks):
         if isinstance(last_updated, datetime):
             last_updated = last_updated.strftime('%Y-%m-%d')
 
-        html += f"""
+        parts.append(f"""
         <div class="risk-item {priority_class}">
             <div class="title">{risk.get('Risk ID', '')}: {risk.get('Title', 'Untitled')}</div>
             <div class="meta">
@@ -608,8 +686,8 @@ def generate_attention_required_html(risks):
                 Last Updated: {last_updated}
             </div>
         </div>
-        """
-    return html
+        """)
+    return ''.join(parts)
 
 
 def generate_tasks_html(tasks):
@@ -625,22 +703,22 @@ def generate_tasks_html(tasks):
             by_owner[owner] = []
         by_owner[owner].append(task)
 
-    html = ''
+    parts = []
     for owner, owner_tasks in sorted(by_owner.items()):
-        html += f'<div class="owner-group"><h3>{owner}</h3>'
+        parts.append(f'<div class="owner-group"><h3>{owner}</h3>')
         for task in owner_tasks:
             due_date = task.get('Due Date', '')
             if isinstance(due_date, datetime):
                 due_date = due_date.strftime('%Y-%m-%d')
 
-            html += f"""
+            parts.append(f"""
             <div class="task-item">
                 <div class="title">{task.get('Task ID', '')}: {task.get('Task', 'Untitled')}</div>
                 <div class="meta">Due: {due_date or 'No date set'} | Source: {task.get('Source', 'Unknown')}</div>
             </div>
-            """
-        html += '</div>'
-    return html
+            """)
+        parts.append('</div>')
+    return ''.join(parts)
 
 
 def generate_recently_closed_html(risks):
@@ -648,13 +726,13 @@ def generate_recently_closed_html(risks):
     if not risks:
         return '<p class="empty-message">No risks closed in the last 7 days.</p>'
 
-    html = ''
+    parts = []
     for risk in risks:
         closed_date = risk.get('Closed Date', '')
         if isinstance(closed_date, datetime):
             closed_date = closed_date.strftime('%Y-%m-%d')
 
-        html += f"""
+        parts.append(f"""
         <div class="risk-item closed-item">
             <div class="title">{risk.get('Risk ID', '')}: {risk.get('Title', 'Untitled')}</div>
             <div class="meta">
@@ -662,8 +740,8 @@ def generate_recently_closed_html(risks):
                 Resolution: {risk.get('Resolution Notes', 'No notes') or 'No notes'}
             </div>
         </div>
-        """
-    return html
+        """)
+    return ''.join(parts)
 
 
 def generate_pdf_report(project_code='HB'):
@@ -883,11 +961,8 @@ def send_digest_email(project_code='HB', recipients=None, attach_pdf=True):
             print(f"[Daily Digest] Warning: Could not generate PDF attachment: {e}")
 
     try:
-        # Connect and send
-        with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-            server.starttls()
-            server.login(EMAIL_FROM, EMAIL_PASSWORD)
-            server.sendmail(EMAIL_FROM, recipient_list, msg.as_string())
+        # Send over the shared connection (one handshake for all of the morning's digests)
+        send_smtp_message(msg, EMAIL_FROM, EMAIL_PASSWORD, to_addrs=recipient_list)
 
         print(f"[Daily Digest] Email sent successfully to {', '.join(recipient_list)}")
         return True
@@ -17,6 +17,7 @@ a = Analysis(
     datas=[
         # Include templates and static files if any
         (str(ROOT_DIR / '.env.example'), '.'),
+        (str(ROOT_DIR / 'templates'), 'templates'),
     ],
     hiddenimports=[
         'flask',
@@ -76,7 +77,8 @@ a = Analysis(
 
 # Also include the other Python modules
 for pyfile in ['process.py', 'daily_digest.py', 'monthly_report.py',
-               'send_monthly_report.py', 'email_reader.py']:
+               'send_monthly_report.py', 'email_reader.py', 'xlsx_writer.py',
+               'report_pdf.py']:
     filepath = ROOT_DIR / pyfile
     if filepath.exists():
         a.datas.append((pyfile, str(filepath), 'DATA'))
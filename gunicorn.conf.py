@@ -0,0 +1,56 @@
+"""
+Gunicorn settings for running the Risk Management server in production.
+
+    pip install gunicorn
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+The app is imported once in the master (preload_app) and the workers are forked
+from it, so the imported modules are shared copy-on-write. Caches filled while
+serving (register data, JSON responses, Graph tokens) are per worker.
+
+The folder watchers and digest scheduler start in one worker, the first to take
+the services lock in post_worker_init, and never in the master: the master forks
+replacement workers at any time, and a fork taken while a watcher or scheduler
+thread holds a lock would leave that lock held forever in the child. If the worker
+running them exits, its replacement takes the lock over.
+
+`SERVER=gunicorn python server.py` (or `python server.py --gunicorn`) also serves
+through gunicorn with these settings. A plain `python server.py`, the desktop bundle
+and FLASK_DEBUG=true use Flask's threaded server.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+workers = int(os.getenv('WEB_CONCURRENCY', (2 * (os.cpu_count() or 1)) + 1))
+worker_class = 'gthread'
+threads = 8
+
+preload_app = True
+
+# Report renders and IMAP/SMTP calls can take a while on a slow mail server
+timeout = 120
+graceful_timeout = 30
+
+# (observer, scheduler) when this worker runs the background services
+_services = None
+
+
+def _background_services_enabled():
+    return os.getenv('BACKGROUND_SERVICES', 'true').strip().lower() not in ('0', 'false', 'no')
+
+
+def post_worker_init(worker):
+    """Start the watchers and digest scheduler unless another worker already runs them."""
+    global _services
+    if _background_services_enabled():
+        from server import start_background_services
+        _services = start_background_services()
+
+
+def worker_exit(server, worker):
+    """Stop the background services if this worker was running them."""
+    if _services is not None:
+        from server import stop_background_services
+        stop_background_services(*_services)
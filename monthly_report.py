@@ -6,6 +6,7 @@ Brand colors: Primary #33A9DC, Secondary #58595B
 
 import os
 import base64
+import functools
 import smtplib
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -16,7 +17,6 @@ from email import encoders
 from io import BytesIO
 
 import openpyxl
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
@@ -25,6 +25,8 @@ from docx.oxml.ns import qn
 from docx.oxml import OxmlElement
 from dotenv import load_dotenv
 
+from xlsx_writer import write_table
+
 load_dotenv()
 
 # Brand Colors (customize during setup)
@@ -50,87 +52,106 @@ def get_logo_base64():
     return None
 
 
+# Date columns per sheet, normalized to YYYY-MM-DD strings when read
+RISK_DATE_HEADERS = frozenset(['Date Identified', 'Last Updated', 'Closed Date'])
+TASK_DATE_HEADERS = frozenset(['Due Date', 'Created Date', 'Completed Date'])
+MILESTONE_DATE_HEADERS = frozenset(['Baseline Date', 'Current Date'])
+
+
+def parse_date(val):
+    """Format a date cell as YYYY-MM-DD; other values are returned as strings."""
+    if val is None:
+        return None
+    if isinstance(val, datetime):
+        return val.strftime('%Y-%m-%d')
+    return str(val)
+
+
+def read_sheet_rows(sheet, min_row, date_headers=frozenset()):
+    """Read a worksheet into a list of dicts keyed by the header row, one pass over the row values."""
+    header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    columns = [(i, h, h in date_headers) for i, h in enumerate(header_row) if h]
+
+    rows = []
+    for values in sheet.iter_rows(min_row=min_row, values_only=True):
+        n = len(values)
+        row_data = {}
+        for i, header, is_date in columns:
+            val = values[i] if i < n else None
+            row_data[header] = parse_date(val) if is_date else val
+        rows.append(row_data)
+    return rows
+
+
+def _register_version(file_path):
+    """Get (mtime_ns, size) for a Risk Register file, or None if it does not exist."""
+    try:
+        st = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@functools.lru_cache(maxsize=16)
+def _load_project_data(file_path, version):
+    """Parse a Risk Register once per file version."""
+    # Read-only mode streams rows instead of building every cell; must be closed
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True, keep_links=False)
+    try:
+        risks = [r for r in read_sheet_rows(wb['Risk Register'], 3, RISK_DATE_HEADERS) if r.get('Risk ID')]
+        tasks = [t for t in read_sheet_rows(wb['Tasks'], 3, TASK_DATE_HEADERS) if t.get('Task ID')]
+
+        milestones = []
+        if 'Milestones' in wb.sheetnames:
+            milestones = [
+                m for m in read_sheet_rows(wb['Milestones'], 2, MILESTONE_DATE_HEADERS)
+                if m.get('Milestone ID') or m.get('Milestone')
+            ]
+
+        updates = []
+        if 'Update Log' in wb.sheetnames:
+            updates = [u for u in read_sheet_rows(wb['Update Log'], 3) if u.get('Timestamp')]
+    finally:
+        wb.close()
+
+    return {'risks': risks, 'tasks': tasks, 'milestones': milestones, 'updates': updates}
+
+
 def read_project_data(project_code):
-    """Read all data from a project's Risk Register."""
+    """
+    Read all data from a project's Risk Register.
+    The parsed data is cached per file version and shared between callers; treat it as read-only.
+    """
     file_path = BASE_PATH / 'Risk_Registers' / f'Risk_Register_{project_code}.xlsx'
 
-    if not file_path.exists():
+    version = _register_version(file_path)
+    if version is None:
         return {'risks': [], 'tasks': [], 'milestones': [], 'updates': []}
 
-    wb = openpyxl.load_workbook(file_path)
+    return _load_project_data(file_path, version)
 
-    def parse_date(val):
-        if val is None:
-            return None
-        if isinstance(val, datetime):
-            return val.strftime('%Y-%m-%d')
-        return str(val)
 
-    # Read risks
-    risks = []
-    risk_sheet = wb['Risk Register']
-    headers = [cell.value for cell in risk_sheet[1]]
+@functools.lru_cache(maxsize=16)
+def _project_report(file_path, version, today):
+    """Parse a Risk Register and score its health once per file version and day."""
+    data = _load_project_data(file_path, version)
+    return data, calculate_project_health(data)
 
-    for row_num in range(3, risk_sheet.max_row + 1):
-        row_data = {}
-        for i, cell in enumerate(risk_sheet[row_num]):
-            if i < len(headers) and headers[i]:
-                val = cell.value
-                if headers[i] in ['Date Identified', 'Last Updated', 'Closed Date']:
-                    val = parse_date(val)
-                row_data[headers[i]] = val
-        if row_data.get('Risk ID'):
-            risks.append(row_data)
-
-    # Read tasks
-    tasks = []
-    task_sheet = wb['Tasks']
-    task_headers = [cell.value for cell in task_sheet[1]]
-
-    for row_num in range(3, task_sheet.max_row + 1):
-        row_data = {}
-        for i, cell in enumerate(task_sheet[row_num]):
-            if i < len(task_headers) and task_headers[i]:
-                val = cell.value
-                if task_headers[i] in ['Due Date', 'Created Date', 'Completed Date']:
-                    val = parse_date(val)
-                row_data[task_headers[i]] = val
-        if row_data.get('Task ID'):
-            tasks.append(row_data)
-
-    # Read milestones
-    milestones = []
-    if 'Milestones' in wb.sheetnames:
-        ms_sheet = wb['Milestones']
-        ms_headers = [cell.value for cell in ms_sheet[1]]
-
-        for row_num in range(2, ms_sheet.max_row + 1):
-            row_data = {}
-            for i, cell in enumerate(ms_sheet[row_num]):
-                if i < len(ms_headers) and ms_headers[i]:
-                    val = cell.value
-                    if ms_headers[i] in ['Baseline Date', 'Current Date']:
-                        val = parse_date(val)
-                    row_data[ms_headers[i]] = val
-            if row_data.get('Milestone ID') or row_data.get('Milestone'):
-                milestones.append(row_data)
-
-    # Read updates
-    updates = []
-    if 'Update Log' in wb.sheetnames:
-        update_sheet = wb['Update Log']
-        update_headers = [cell.value for cell in update_sheet[1]]
-
-        for row_num in range(3, update_sheet.max_row + 1):
-            row_data = {}
-            for i, cell in enumerate(update_sheet[row_num]):
-                if i < len(update_headers) and update_headers[i]:
-                    row_data[update_headers[i]] = cell.value
-            if row_data.get('Timestamp'):
-                updates.append(row_data)
-
-    wb.close()
-    return {'risks': risks, 'tasks': tasks, 'milestones': milestones, 'updates': updates}
+
+def get_project_report(project_code):
+    """
+    Get (data, health) for a project's monthly report, cached per Risk Register version.
+    Preview, email and Word/Excel downloads share the result; treat it as read-only.
+    """
+    file_path = BASE_PATH / 'Risk_Registers' / f'Risk_Register_{project_code}.xlsx'
+
+    version = _register_version(file_path)
+    if version is None:
+        data = {'risks': [], 'tasks': [], 'milestones': [], 'updates': []}
+        return data, calculate_project_health(data)
+
+    # Overdue counts depend on today's date, so the day is part of the key
+    return _project_report(file_path, version, datetime.now().date())
 
 
 def calculate_project_health(data):
@@ -249,7 +270,7 @@ def generate_html_email(project_code, data, health, report_date=None):
     ORANGE_500 = '#f97316'
     GREEN_500 = '#22c55e'
 
-    html = f'''<!DOCTYPE html>
+    parts = [f'''<!DOCTYPE html>
 <html>
 <head>
     <meta charset="UTF-8">
@@ -491,34 +512,34 @@ def generate_html_email(project_code, data, health, report_date=None):
                 <div class="section-title">Executive Summary</div>
                 <div class="executive-summary">{executive_summary}</div>
             </div>
-'''
+''']
 
     # Critical Alerts
     if health['high_high_risks'] > 0 or health['critical_milestones'] > 0:
-        html += '''
+        parts.append('''
             <div class="section">
                 <div class="section-title">Critical Alerts</div>
-'''
+''')
         for r in high_risks[:3]:
-            html += f'''
+            parts.append(f'''
                 <div class="alert-box">
                     <strong>{r.get('Risk ID', '')}</strong>: {str(r.get('Description', ''))[:200]}
                     <br><small>Mitigation: {str(r.get('Mitigation', 'TBD'))[:150]}</small>
                 </div>
-'''
+''')
         for m in critical_milestones[:2]:
             m_status = m.get('Status', '')
             m_badge = 'badge-critical' if m_status == 'Critical' else 'badge-at-risk'
-            html += f'''
+            parts.append(f'''
                 <div class="alert-box warning">
                     <strong>Milestone:</strong> {m.get('Milestone', '')} - <span class="badge {m_badge}">{m_status}</span>
                     <br><small>Baseline: {m.get('Baseline Date', 'TBD')} | Current: {m.get('Current Date', 'TBD')}</small>
                 </div>
-'''
-        html += '</div>'
+''')
+        parts.append('</div>')
 
     # Schedule/Milestones Section
-    html += '''
+    parts.append('''
             <div class="section">
                 <div class="section-title">Schedule & Milestones</div>
                 <table>
@@ -528,7 +549,7 @@ def generate_html_email(project_code, data, health, report_date=None):
                         <th>Current</th>
                         <th>Status</th>
                     </tr>
-'''
+''')
     for m in milestones[:8]:
         status = m.get('Status', 'On Track')
         if status == 'Critical':
@@ -541,21 +562,21 @@ def generate_html_email(project_code, data, health, report_date=None):
             badge_class = 'badge-on-track'
         else:
             badge_class = 'badge-open'
-        html += f'''
+        parts.append(f'''
                     <tr>
                         <td>{m.get('Milestone', '')}</td>
                         <td>{m.get('Baseline Date', '')}</td>
                         <td>{m.get('Current Date', '')}</td>
                         <td><span class="badge {badge_class}">{status}</span></td>
                     </tr>
-'''
-    html += '''
+''')
+    parts.append('''
                 </table>
             </div>
-'''
+''')
 
     # Risks Section
-    html += '''
+    parts.append('''
             <div class="section">
                 <div class="section-title">Risk Register Summary</div>
                 <table>
@@ -565,7 +586,7 @@ def generate_html_email(project_code, data, health, report_date=None):
                         <th>Prob/Impact</th>
                         <th>Status</th>
                     </tr>
-'''
+''')
     for r in active_risks[:10]:
         prob = r.get('Probability', '')
         r_status = r.get('Status', '')
@@ -581,21 +602,21 @@ def generate_html_email(project_code, data, health, report_date=None):
             status_badge = 'badge-high'
         else:
             status_badge = 'badge-open'
-        html += f'''
+        parts.append(f'''
                     <tr>
                         <td>{r.get('Risk ID', '')}</td>
                         <td>{str(r.get('Description', ''))[:80]}</td>
                         <td><span class="badge {prob_badge}">{prob}/{r.get('Impact', '')}</span></td>
                         <td><span class="badge {status_badge}">{r_status}</span></td>
                     </tr>
-'''
-    html += '''
+''')
+    parts.append('''
                 </table>
             </div>
-'''
+''')
 
     # Tasks Section
-    html += '''
+    parts.append('''
             <div class="section">
                 <div class="section-title">Action Items</div>
                 <table>
@@ -605,40 +626,39 @@ def generate_html_email(project_code, data, health, report_date=None):
                         <th>Due Date</th>
                         <th>Status</th>
                     </tr>
-'''
+''')
     for t in open_tasks[:10]:
         t_status = t.get('Status', 'Open')
-        html += f'''
+        parts.append(f'''
                     <tr>
                         <td>{str(t.get('Task', ''))[:60]}</td>
                         <td>{t.get('Owner', '')}</td>
                         <td>{t.get('Due Date', '')}</td>
                         <td><span class="badge badge-open">{t_status}</span></td>
                     </tr>
-'''
-    html += '''
+''')
+    parts.append('''
                 </table>
             </div>
-'''
+''')
 
     # Safety Section (placeholder)
-    html += '''
+    parts.append('''
             <div class="section">
                 <div class="section-title">Safety & Compliance</div>
                 <p style="color: #38a169;">No safety incidents reported this period.</p>
                 <p>All work continues in compliance with applicable regulations and safety protocols.</p>
             </div>
-'''
+''')
 
     # Next Steps
-    html += '''
+    parts.append('''
             <div class="section">
                 <div class="section-title">Next Steps</div>
                 <ul>
-'''
-    for t in open_tasks[:5]:
-        html += f'<li>{str(t.get("Task", ""))[:100]}</li>'
-    html += '''
+''')
+    parts.extend(f'<li>{str(t.get("Task", ""))[:100]}</li>' for t in open_tasks[:5])
+    parts.append('''
                 </ul>
             </div>
         </div>
@@ -649,9 +669,9 @@ def generate_html_email(project_code, data, health, report_date=None):
         </div>
     </div>
 </body>
-</html>'''
+</html>''')
 
-    return html
+    return ''.join(parts)
 
 
 def generate_word_document(project_code, data, health, report_date=None):
@@ -834,56 +854,12 @@ def generate_word_document(project_code, data, health, report_date=None):
 
 def generate_task_export(project_code, data):
     """Generate Excel export of tasks."""
-    wb = openpyxl.Workbook()
-    ws = wb.active
-    ws.title = 'Task List'
-
-    # Header styling
-    header_fill = PatternFill(start_color='33A9DC', end_color='33A9DC', fill_type='solid')
-    header_font = Font(bold=True, color='FFFFFF', size=11)
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
-
-    # Headers
     headers = ['Task ID', 'Task', 'Owner', 'Due Date', 'Status', 'Priority', 'Source']
-    for col, header in enumerate(headers, 1):
-        cell = ws.cell(row=1, column=col, value=header)
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.border = thin_border
-        cell.alignment = Alignment(horizontal='center', vertical='center')
-
-    # Data
-    tasks = data['tasks']
-    for row_num, task in enumerate(tasks, 2):
-        ws.cell(row=row_num, column=1, value=task.get('Task ID', ''))
-        ws.cell(row=row_num, column=2, value=task.get('Task', ''))
-        ws.cell(row=row_num, column=3, value=task.get('Owner', ''))
-        ws.cell(row=row_num, column=4, value=task.get('Due Date', ''))
-        ws.cell(row=row_num, column=5, value=task.get('Status', ''))
-        ws.cell(row=row_num, column=6, value=task.get('Priority', ''))
-        ws.cell(row=row_num, column=7, value=task.get('Source', ''))
-
-        for col in range(1, 8):
-            ws.cell(row=row_num, column=col).border = thin_border
-
-    # Column widths
-    ws.column_dimensions['A'].width = 12
-    ws.column_dimensions['B'].width = 50
-    ws.column_dimensions['C'].width = 15
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 12
-    ws.column_dimensions['F'].width = 10
-    ws.column_dimensions['G'].width = 15
-
-    buffer = BytesIO()
-    wb.save(buffer)
-    buffer.seek(0)
-    return buffer
+    rows = (
+        [task.get(header, '') for header in headers]
+        for task in data['tasks']
+    )
+    return write_table('Task List', headers, rows, column_widths=[12, 50, 15, 12, 12, 10, 15])
 
 
 def send_monthly_report(project_code, recipients, report_date=None, include_attachments=True):
@@ -906,11 +882,10 @@ def send_monthly_report(project_code, recipients, report_date=None, include_atta
         recipients = [recipients]
 
     # Load project data
-    data = read_project_data(project_code)
+    data, health = get_project_report(project_code)
     if not data['risks'] and not data['tasks']:
         return {'success': False, 'error': f'No data found for project {project_code}'}
 
-    health = calculate_project_health(data)
     project_name = PROJECT_NAMES.get(project_code, project_code)
 
     # Generate content
@@ -997,8 +972,7 @@ def preview_monthly_report(project_code, report_date=None):
     if report_date is None:
         report_date = datetime.now()
 
-    data = read_project_data(project_code)
-    health = calculate_project_health(data)
+    data, health = get_project_report(project_code)
 
     return generate_html_email(project_code, data, health, report_date)
 
@@ -5,6 +5,7 @@ Updates Risk Register Excel files with extracted data.
 
 import json
 import os
+import uuid
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
@@ -13,6 +14,19 @@ import anthropic
 import openpyxl
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from rapidfuzz import fuzz, process as fuzz_process
+except ImportError:
+    fuzz = None
+
+# Minimum token_sort_ratio for two risk titles to be treated as the same risk
+DUPLICATE_TITLE_THRESHOLD = 90
+
 # Load environment variables
 load_dotenv()
 
@@ -145,13 +159,68 @@ def get_next_task_id(worksheet) -> str:
     return f"T-{str(max_num + 1).zfill(3)}"
 
 
+def get_existing_titles(worksheet) -> dict:
+    """Map normalized risk titles to their row numbers in a single column scan."""
+    titles = {}
+    for row, (title,) in enumerate(
+        worksheet.iter_rows(min_row=2, min_col=2, max_col=2, values_only=True), start=2
+    ):
+        if title:
+            titles.setdefault(str(title).strip().lower(), row)
+    return titles
+
+
+def find_duplicate_risk(title: str, existing_titles: dict):
+    """Return the row of an existing risk matching title, or None if it is new."""
+    key = (title or "").strip().lower()
+    if not key:
+        return None
+    if key in existing_titles:
+        return existing_titles[key]
+
+    # Catch rewordings of the same risk coming from different sources. token_sort_ratio
+    # (unlike token_set_ratio) penalizes extra words, so "Budget overrun" does not
+    # match "Budget overrun on phase 2 steel".
+    if fuzz is not None and existing_titles:
+        match = fuzz_process.extractOne(
+            key, existing_titles.keys(),
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=DUPLICATE_TITLE_THRESHOLD
+        )
+        if match:
+            return existing_titles[match[0]]
+
+    return None
+
+
+def note_duplicate_risk(worksheet, row: int, source_name: str, today: str):
+    """Record a repeat mention in an existing risk's Update History. Returns its Risk ID."""
+    history = worksheet.cell(row=row, column=15).value
+    note = f"{today}: Raised again in {source_name}"
+    worksheet.cell(row=row, column=15, value=f"{history}\n{note}" if history else note)
+    worksheet.cell(row=row, column=14, value=today)  # Last Updated
+    return worksheet.cell(row=row, column=1).value
+
+
 def update_risk_register(workbook, risks: list, source_name: str) -> list:
-    """Add new risks to the Risk Register sheet. Returns list of changes made."""
+    """Add new risks to the Risk Register sheet. Returns list of changes made.
+
+    Risks whose title matches an existing entry are not appended again; a note
+    is added to the Update History of the matching row instead.
+    """
     ws = workbook["Risk Register"]
     changes = []
     today = datetime.now().strftime("%Y-%m-%d")
+    existing_titles = get_existing_titles(ws)
 
     for risk in risks:
+        title = risk.get("title") or ""
+        duplicate_row = find_duplicate_risk(title, existing_titles)
+        if duplicate_row is not None:
+            existing_id = note_duplicate_risk(ws, duplicate_row, source_name, today)
+            changes.append(f"Updated Risk {existing_id}: {title} (already in register)")
+            continue
+
         next_id = get_next_risk_id(ws)
         risk_score = calculate_risk_score(
             risk.get("probability", "Medium"),
@@ -165,7 +234,7 @@ def update_risk_register(workbook, risks: list, source_name: str) -> list:
         # Risk Score, Status, Trend, Owner, Mitigation Plan, Linked Tasks,
         # Date Identified, Last Updated, Update History, Source, Closed Date, Resolution Notes
         ws.cell(row=next_row, column=1, value=next_id)
-        ws.cell(row=next_row, column=2, value=risk.get("title", ""))
+        ws.cell(row=next_row, column=2, value=title)
         ws.cell(row=next_row, column=3, value=risk.get("description", ""))
         ws.cell(row=next_row, column=4, value=risk.get("category", ""))
         ws.cell(row=next_row, column=5, value=risk.get("probability", "Medium"))
@@ -181,7 +250,10 @@ def update_risk_register(workbook, risks: list, source_name: str) -> list:
         ws.cell(row=next_row, column=15, value=f"{today}: Created from {source_name}")
         ws.cell(row=next_row, column=16, value=source_name)
 
-        changes.append(f"Added Risk {next_id}: {risk.get('title', '')}")
+        if title.strip():
+            existing_titles[title.strip().lower()] = next_row
+
+        changes.append(f"Added Risk {next_id}: {title}")
 
     return changes
 
@@ -214,23 +286,100 @@ def update_tasks(workbook, tasks: list, source_name: str) -> list:
     return changes
 
 
-def log_update(workbook, source_name: str, source_type: str, changes: list, raw_extract: dict):
+def dump_raw_extract(raw_extract: dict, limit: int = 32000) -> str:
+    """Serialize the raw extract as indented JSON, truncated to the Excel cell limit."""
+    if orjson is not None:
+        # Truncate before decoding so the discarded tail is never decoded
+        return orjson.dumps(raw_extract, option=orjson.OPT_INDENT_2)[:limit].decode('utf-8', errors='ignore')
+    return json.dumps(raw_extract, indent=2)[:limit]
+
+
+def log_update(workbook, source_name: str, source_type: str, changes: list, raw_extract: dict,
+               timestamp: str = None):
     """Add entry to the Update Log sheet."""
     ws = workbook["Update Log"]
 
     # Find next empty row
     next_row = ws.max_row + 1
 
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     changes_text = "\n".join(changes) if changes else "No changes made"
-    raw_text = json.dumps(raw_extract, indent=2)
+    raw_text = dump_raw_extract(raw_extract)
 
     # Columns: Timestamp, Source, Source Type, Changes Made, Raw Extract
     ws.cell(row=next_row, column=1, value=timestamp)
     ws.cell(row=next_row, column=2, value=source_name)
     ws.cell(row=next_row, column=3, value=source_type)
     ws.cell(row=next_row, column=4, value=changes_text)
-    ws.cell(row=next_row, column=5, value=raw_text[:32000])  # Excel cell limit
+    ws.cell(row=next_row, column=5, value=raw_text)
+
+
+def get_pending_log_path(risk_register_path: Path) -> Path:
+    """Get the JSONL file holding Update Log entries not yet written to the workbook."""
+    return risk_register_path.with_name(f"{risk_register_path.stem}_update_log.jsonl")
+
+
+def queue_log_entry(risk_register_path: Path, source_name: str, source_type: str, raw_extract: dict):
+    """
+    Record a run that produced no changes without opening the workbook.
+    Queued entries are written to the Update Log by flush_pending_log.
+    """
+    entry = {
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "source": source_name,
+        "source_type": source_type,
+        "raw_extract": raw_extract,
+    }
+    with open(get_pending_log_path(risk_register_path), "a", encoding="utf-8") as f:
+        f.write(json.dumps(entry) + "\n")
+
+
+def flush_pending_log(workbook, risk_register_path: Path) -> tuple:
+    """
+    Write queued log entries into the Update Log sheet.
+    The queue file is renamed aside before it is read, so entries queued while the
+    workbook is being updated start a new queue instead of being lost. Returns
+    (number of entries written, claimed file or None). Once the workbook has been
+    saved, pass the claimed file to clear_pending_log; if the save fails, pass it to
+    restore_pending_log.
+    """
+    log_path = get_pending_log_path(risk_register_path)
+    claimed = log_path.with_name(f"{log_path.stem}.{uuid.uuid4().hex}.jsonl")
+    try:
+        os.replace(log_path, claimed)
+    except FileNotFoundError:
+        return 0, None
+    except PermissionError:
+        # Windows: a writer has the queue open; its entries go with the next flush
+        return 0, None
+
+    count = 0
+    with open(claimed, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            log_update(workbook, entry["source"], entry["source_type"], [],
+                       entry["raw_extract"], timestamp=entry["timestamp"])
+            count += 1
+    return count, claimed
+
+
+def clear_pending_log(claimed: Optional[Path]):
+    """Remove a queue file claimed by flush_pending_log after its entries have been saved."""
+    if claimed is not None:
+        claimed.unlink(missing_ok=True)
+
+
+def restore_pending_log(risk_register_path: Path, claimed: Optional[Path]):
+    """Put the entries of a claimed queue file back in the queue when the workbook save failed."""
+    if claimed is None:
+        return
+    with open(claimed, "r", encoding="utf-8") as f:
+        entries = f.read()
+    with open(get_pending_log_path(risk_register_path), "a", encoding="utf-8") as f:
+        f.write(entries)
+    claimed.unlink(missing_ok=True)
 
 
 def process_content(
@@ -288,6 +437,30 @@ def process_content(
             "extracted_data": None
         }
 
+    # Nothing to add: record the run without loading and re-saving the workbook.
+    # Queued entries reach the Update Log sheet on the next real update.
+    if not extracted_data.get("risks") and not extracted_data.get("tasks"):
+        try:
+            queue_log_entry(risk_register_path, source_name, source_type, extracted_data)
+        except OSError as e:
+            return {
+                "success": False,
+                "error": f"Failed to queue Update Log entry: {str(e)}",
+                "changes": [],
+                "extracted_data": extracted_data
+            }
+        return {
+            "success": True,
+            "error": None,
+            "changes": [],
+            "extracted_data": extracted_data,
+            "summary": {
+                "risks_added": 0,
+                "tasks_added": 0,
+                "decisions_found": len(extracted_data.get("decisions", []))
+            }
+        }
+
     # Load Risk Register workbook
     try:
         workbook = openpyxl.load_workbook(risk_register_path)
@@ -299,6 +472,9 @@ def process_content(
             "extracted_data": extracted_data
         }
 
+    # Write runs queued while there was nothing to add, oldest first
+    _, pending_log = flush_pending_log(workbook, risk_register_path)
+
     # Update Risk Register with extracted data
     all_changes = []
 
@@ -317,12 +493,14 @@ def process_content(
     try:
         workbook.save(risk_register_path)
     except Exception as e:
+        restore_pending_log(risk_register_path, pending_log)
         return {
             "success": False,
             "error": f"Failed to save Risk Register: {str(e)}",
             "changes": all_changes,
             "extracted_data": extracted_data
         }
+    clear_pending_log(pending_log)
 
     return {
         "success": True,
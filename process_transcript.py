@@ -5,6 +5,7 @@ Updates the project Risk Register Excel file and logs all changes.
 """
 
 import argparse
+import asyncio
 import json
 import os
 import sys
@@ -15,6 +16,23 @@ import anthropic
 import openpyxl
 from openpyxl.utils import get_column_letter
 
+from process import (
+    clear_pending_log,
+    dump_raw_extract,
+    find_duplicate_risk,
+    flush_pending_log,
+    get_existing_titles,
+    get_pending_log_path,
+    note_duplicate_risk,
+    queue_log_entry,
+    restore_pending_log,
+)
+
+CLAUDE_MODEL = "claude-sonnet-4-20250514"
+
+# Maximum concurrent Claude requests when processing a batch of transcripts
+BATCH_CONCURRENCY = 5
+
 
 def parse_arguments():
     """Parse command line arguments."""
@@ -27,9 +45,10 @@ def parse_arguments():
         help="Project code (e.g., HB, NSD, RH)"
     )
     parser.add_argument(
-        "transcript_path",
+        "transcript_paths",
         type=str,
-        help="Path to the transcript file"
+        nargs="*",
+        help="Path to the transcript file (several paths are processed as one batch)"
     )
     parser.add_argument(
         "--risk-register",
@@ -37,7 +56,15 @@ def parse_arguments():
         default=None,
         help="Path to Risk Register Excel file (default: Risk_Registers/Risk_Register_{PROJECT_CODE}.xlsx)"
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--flush-log",
+        action="store_true",
+        help="Write queued no-change log entries into the Update Log sheet"
+    )
+    args = parser.parse_args()
+    if not args.transcript_paths and not args.flush_log:
+        parser.error("at least one transcript_path is required unless --flush-log is given")
+    return args
 
 
 def load_transcript(transcript_path: str) -> str:
@@ -50,14 +77,9 @@ def load_transcript(transcript_path: str) -> str:
         return f.read()
 
 
-def extract_data_with_claude(transcript: str, project_code: str) -> dict:
-    """
-    Send transcript to Claude API to extract risks, tasks, and decisions.
-    Returns structured data for Excel update.
-    """
-    client = anthropic.Anthropic()
-
-    extraction_prompt = f"""Analyze this meeting transcript for project {project_code} and extract the following information in JSON format:
+def build_extraction_prompt(transcript: str, project_code: str) -> str:
+    """Build the Claude extraction prompt for a transcript."""
+    return f"""Analyze this meeting transcript for project {project_code} and extract the following information in JSON format:
 
 1. **Risks**: Any mentioned risks, concerns, potential issues, or problems that could affect the project.
 2. **Tasks**: Action items, assignments, or work that needs to be done.
@@ -117,16 +139,9 @@ TRANSCRIPT:
 {transcript}
 """
 
-    message = client.messages.create(
-        model="claude-sonnet-4-20250514",
-        max_tokens=4096,
-        messages=[
-            {"role": "user", "content": extraction_prompt}
-        ]
-    )
-
-    response_text = message.content[0].text
 
+def parse_extraction_response(response_text: str) -> dict:
+    """Parse the JSON payload out of a Claude response."""
     # Extract JSON from response (handle potential markdown code blocks)
     if "```json" in response_text:
         response_text = response_text.split("```json")[1].split("```")[0]
@@ -136,6 +151,48 @@ TRANSCRIPT:
     return json.loads(response_text.strip())
 
 
+def extract_data_with_claude(transcript: str, project_code: str) -> dict:
+    """
+    Send transcript to Claude API to extract risks, tasks, and decisions.
+    Returns structured data for Excel update.
+    """
+    client = anthropic.Anthropic()
+
+    message = client.messages.create(
+        model=CLAUDE_MODEL,
+        max_tokens=4096,
+        messages=[
+            {"role": "user", "content": build_extraction_prompt(transcript, project_code)}
+        ]
+    )
+
+    return parse_extraction_response(message.content[0].text)
+
+
+async def extract_batch_with_claude(transcripts: list, project_code: str,
+                                    concurrency: int = BATCH_CONCURRENCY) -> list:
+    """
+    Extract data from several transcripts concurrently.
+    Returns one result per transcript, in order; failed extractions are
+    returned as the raised exception.
+    """
+    client = anthropic.AsyncAnthropic()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def extract(transcript):
+        async with semaphore:
+            message = await client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=4096,
+                messages=[
+                    {"role": "user", "content": build_extraction_prompt(transcript, project_code)}
+                ]
+            )
+        return parse_extraction_response(message.content[0].text)
+
+    return await asyncio.gather(*(extract(t) for t in transcripts), return_exceptions=True)
+
+
 def calculate_risk_score(probability: str, impact: str) -> int:
     """Calculate risk score from probability and impact."""
     prob_values = {"Low": 1, "Medium": 2, "High": 3}
@@ -175,12 +232,24 @@ def get_next_id(worksheet, id_column: int = 1) -> str:
 
 
 def update_risk_register(workbook, risks: list, source: str) -> list:
-    """Add new risks to the Risk Register sheet. Returns list of changes made."""
+    """Add new risks to the Risk Register sheet. Returns list of changes made.
+
+    Risks whose title matches an existing entry are not appended again; a note
+    is added to the Update History of the matching row instead.
+    """
     ws = workbook["Risk Register"]
     changes = []
     today = datetime.now().strftime("%Y-%m-%d")
+    existing_titles = get_existing_titles(ws)
 
     for risk in risks:
+        title = risk.get("title") or ""
+        duplicate_row = find_duplicate_risk(title, existing_titles)
+        if duplicate_row is not None:
+            existing_id = note_duplicate_risk(ws, duplicate_row, source, today)
+            changes.append(f"Updated Risk {existing_id}: {title} (already in register)")
+            continue
+
         next_id = get_next_id(ws)
         risk_score = calculate_risk_score(risk.get("probability", "Medium"),
                                           risk.get("impact", "Medium"))
@@ -192,7 +261,7 @@ def update_risk_register(workbook, risks: list, source: str) -> list:
         # Risk Score, Status, Trend, Owner, Mitigation Plan, Linked Tasks,
         # Date Identified, Last Updated, Update History, Source, Closed Date, Resolution Notes
         ws.cell(row=next_row, column=1, value=next_id)
-        ws.cell(row=next_row, column=2, value=risk.get("title", ""))
+        ws.cell(row=next_row, column=2, value=title)
         ws.cell(row=next_row, column=3, value=risk.get("description", ""))
         ws.cell(row=next_row, column=4, value=risk.get("category", ""))
         ws.cell(row=next_row, column=5, value=risk.get("probability", "Medium"))
@@ -208,7 +277,10 @@ def update_risk_register(workbook, risks: list, source: str) -> list:
         ws.cell(row=next_row, column=15, value=f"{today}: Created from transcript")
         ws.cell(row=next_row, column=16, value=source)
 
-        changes.append(f"Added Risk {next_id}: {risk.get('title', '')}")
+        if title.strip():
+            existing_titles[title.strip().lower()] = next_row
+
+        changes.append(f"Added Risk {next_id}: {title}")
 
     return changes
 
@@ -241,23 +313,69 @@ def update_tasks(workbook, tasks: list, source: str) -> list:
     return changes
 
 
-def log_update(workbook, source: str, source_type: str, changes: list, raw_extract: dict):
+def log_update(workbook, source: str, source_type: str, changes: list, raw_extract: dict,
+               timestamp: str = None):
     """Add entry to the Update Log sheet."""
     ws = workbook["Update Log"]
 
     # Find next empty row
     next_row = ws.max_row + 1
 
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    timestamp = timestamp or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     changes_text = "\n".join(changes) if changes else "No changes made"
-    raw_text = json.dumps(raw_extract, indent=2)
+    raw_text = dump_raw_extract(raw_extract)
 
     # Columns: Timestamp, Source, Source Type, Changes Made, Raw Extract
     ws.cell(row=next_row, column=1, value=timestamp)
     ws.cell(row=next_row, column=2, value=source)
     ws.cell(row=next_row, column=3, value=source_type)
     ws.cell(row=next_row, column=4, value=changes_text)
-    ws.cell(row=next_row, column=5, value=raw_text[:32000])  # Excel cell limit
+    ws.cell(row=next_row, column=5, value=raw_text)
+
+
+def process_transcript_batch(project_code: str, transcript_paths: list,
+                             risk_register_path: Path) -> list:
+    """
+    Process several transcripts against one Risk Register.
+    Extractions run concurrently; the workbook is loaded and saved once for
+    the whole batch. Returns the list of changes made.
+    """
+    transcripts = [load_transcript(str(path)) for path in transcript_paths]
+
+    print(f"Extracting data from {len(transcripts)} transcripts using Claude API...")
+    results = asyncio.run(extract_batch_with_claude(transcripts, project_code))
+
+    print(f"Updating Risk Register: {risk_register_path}")
+    workbook = openpyxl.load_workbook(risk_register_path)
+    _, pending_log = flush_pending_log(workbook, risk_register_path)
+    all_changes = []
+
+    for path, extracted_data in zip(transcript_paths, results):
+        source_name = Path(path).stem
+
+        if isinstance(extracted_data, Exception):
+            print(f"  Skipping {source_name}: {extracted_data}")
+            continue
+
+        changes = []
+        if extracted_data.get("risks"):
+            changes.extend(update_risk_register(workbook, extracted_data["risks"], source_name))
+        if extracted_data.get("tasks"):
+            changes.extend(update_tasks(workbook, extracted_data["tasks"], source_name))
+
+        log_update(workbook, source_name, "Meeting Transcript", changes, extracted_data)
+        print(f"  {source_name}: {len(changes)} changes")
+        all_changes.extend(changes)
+
+    try:
+        workbook.save(risk_register_path)
+    except Exception:
+        restore_pending_log(risk_register_path, pending_log)
+        raise
+    clear_pending_log(pending_log)
+    print(f"\nSuccessfully updated {risk_register_path}")
+
+    return all_changes
 
 
 def main():
@@ -277,10 +395,40 @@ def main():
         print(f"Error: Risk Register not found at {risk_register_path}")
         sys.exit(1)
 
+    if args.flush_log:
+        workbook = openpyxl.load_workbook(risk_register_path)
+        count, pending_log = flush_pending_log(workbook, risk_register_path)
+        if count:
+            try:
+                workbook.save(risk_register_path)
+            except Exception:
+                restore_pending_log(risk_register_path, pending_log)
+                raise
+        clear_pending_log(pending_log)
+        print(f"Flushed {count} queued log entries to {risk_register_path}")
+        if not args.transcript_paths:
+            return
+
+    if len(args.transcript_paths) > 1:
+        try:
+            all_changes = process_transcript_batch(
+                args.project_code, args.transcript_paths, risk_register_path
+            )
+        except FileNotFoundError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+
+        print("\n=== Summary ===")
+        for change in all_changes:
+            print(f"  - {change}")
+        return
+
+    transcript_path = args.transcript_paths[0]
+
     # Load transcript
-    print(f"Loading transcript from: {args.transcript_path}")
+    print(f"Loading transcript from: {transcript_path}")
     try:
-        transcript = load_transcript(args.transcript_path)
+        transcript = load_transcript(transcript_path)
     except FileNotFoundError as e:
         print(f"Error: {e}")
         sys.exit(1)
@@ -300,12 +448,19 @@ def main():
     print(f"  Found {len(extracted_data.get('tasks', []))} tasks")
     print(f"  Found {len(extracted_data.get('decisions', []))} decisions")
 
+    # Derive source name from transcript filename
+    source_name = Path(transcript_path).stem
+
+    # Nothing to write: queue the log entry instead of rewriting the workbook
+    if not extracted_data.get("risks") and not extracted_data.get("tasks"):
+        queue_log_entry(risk_register_path, source_name, "Meeting Transcript", extracted_data)
+        print(f"No risks or tasks found; queued log entry in {get_pending_log_path(risk_register_path)}")
+        return
+
     # Load Risk Register workbook
     print(f"Updating Risk Register: {risk_register_path}")
     workbook = openpyxl.load_workbook(risk_register_path)
-
-    # Derive source name from transcript filename
-    source_name = Path(args.transcript_path).stem
+    _, pending_log = flush_pending_log(workbook, risk_register_path)
 
     # Update Risk Register with extracted data
     all_changes = []
@@ -313,7 +468,7 @@ def main():
     if extracted_data.get("risks"):
         risk_changes = update_risk_register(workbook, extracted_data["risks"], source_name)
         all_changes.extend(risk_changes)
-        print(f"  Added {len(risk_changes)} risks to Risk Register")
+        print(f"  Recorded {len(risk_changes)} risk changes in Risk Register")
 
     if extracted_data.get("tasks"):
         task_changes = update_tasks(workbook, extracted_data["tasks"], source_name)
@@ -325,7 +480,12 @@ def main():
     print("  Logged changes to Update Log sheet")
 
     # Save workbook
-    workbook.save(risk_register_path)
+    try:
+        workbook.save(risk_register_path)
+    except Exception:
+        restore_pending_log(risk_register_path, pending_log)
+        raise
+    clear_pending_log(pending_log)
     print(f"\nSuccessfully updated {risk_register_path}")
 
     # Print summary
@@ -0,0 +1,86 @@
+"""
+ReportLab layout for the status report PDF.
+Takes plain, picklable report data so PDFs can be built in worker processes;
+keep this module free of Flask and server imports.
+"""
+
+import io
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import letter
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+
+ROW_TABLE_STYLE = [
+    ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#edf2f7')),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+]
+
+
+def build_status_report_pdf(spec):
+    """
+    Build the status report PDF and return its bytes.
+
+    Args:
+        spec: dict with
+            title: Report title
+            generated: Generation time text
+            summary: [active risks, high/high risks, open tasks, projects] as strings
+            risk_rows: [project, risk ID, description, prob/impact] rows, or empty
+            task_rows: [project, task ID, task, due date] rows, or empty
+    """
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+
+    styles = getSampleStyleSheet()
+    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=18, textColor=colors.HexColor('#1e3a5f'))
+    heading_style = ParagraphStyle('Heading', parent=styles['Heading2'], fontSize=14, textColor=colors.HexColor('#2c5282'))
+
+    elements = []
+
+    # Title
+    elements.append(Paragraph(spec['title'], title_style))
+    elements.append(Paragraph(f"Generated: {spec['generated']}", styles['Normal']))
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Summary
+    summary_data = [
+        ['Active Risks', 'High/High', 'Open Tasks', 'Projects'],
+        spec['summary']
+    ]
+    summary_table = Table(summary_data, colWidths=[1.5*inch]*4)
+    summary_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3a5f')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 1), (-1, 1), 16),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
+        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
+    ]))
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.3*inch))
+
+    # Active risks
+    elements.append(Paragraph("Active Risks", heading_style))
+    if spec['risk_rows']:
+        risk_data = [['Project', 'Risk ID', 'Description', 'Prob/Impact']] + spec['risk_rows']
+        risk_table = Table(risk_data, colWidths=[0.8*inch, 1*inch, 3.5*inch, 1*inch])
+        risk_table.setStyle(TableStyle(ROW_TABLE_STYLE))
+        elements.append(risk_table)
+    elements.append(Spacer(1, 0.2*inch))
+
+    # Open tasks
+    elements.append(Paragraph("Open Tasks", heading_style))
+    if spec['task_rows']:
+        task_data = [['Project', 'Task ID', 'Task', 'Due Date']] + spec['task_rows']
+        task_table = Table(task_data, colWidths=[0.8*inch, 1*inch, 3.5*inch, 1*inch])
+        task_table.setStyle(TableStyle(ROW_TABLE_STYLE))
+        elements.append(task_table)
+
+    doc.build(elements)
+    return buffer.getvalue()
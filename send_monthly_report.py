@@ -3,14 +3,25 @@ Send Monthly Risk Report with Executive Summary and Risk Register attachments.
 Generates dynamic content from Risk Register data.
 """
 
-import smtplib
+import base64
+import functools
+import io
+import mmap
 import os
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.application import MIMEApplication
+from email import encoders
 from datetime import datetime
 from pathlib import Path
 from dotenv import load_dotenv
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from markupsafe import Markup
+
+from daily_digest import get_portfolio_summary, get_critical_alerts, open_smtp, send_smtp_bytes
 
 load_dotenv()
 
@@ -20,262 +31,189 @@ SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
 EMAIL_FROM = os.getenv('EMAIL_FROM')
 EMAIL_PASSWORD = os.getenv('EMAIL_PASSWORD')
 
+# Send all Risk Registers as one stored (uncompressed) ZIP instead of separate XLSX files
+ZIP_ATTACHMENTS = os.getenv('MONTHLY_REPORT_ZIP', '').strip().lower() in ('1', 'true', 'yes')
+
+XLSX_SUBTYPE = 'vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Bytes encoded per base64 block; a multiple of 57 so every block ends on a full 76-char line
+ENCODE_CHUNK_SIZE = 57 * 1149  # ~64 KiB
+
 BASE_PATH = Path(__file__).parent.resolve()
+TEMPLATE_DIR = BASE_PATH / 'templates'
+
+# Templates are compiled on first use and never re-read from disk. The compiled
+# bytecode is also cached in the temp folder, so later runs skip lexing and parsing.
+_ENV = Environment(
+    loader=FileSystemLoader(str(TEMPLATE_DIR)),
+    bytecode_cache=FileSystemBytecodeCache(),
+    autoescape=select_autoescape(['html', 'j2']),
+    auto_reload=False,
+    trim_blocks=True,
+    lstrip_blocks=True,
+)
+
+# CSS classes for each project health value (trusted markup, skips escaping)
+_STATUS_CLASS = {'Critical': Markup('status-critical'), 'At Risk': Markup('status-at-risk')}
+_BORDER_CLASS = {'Critical': Markup('critical'), 'At Risk': Markup('critical')}
+_ENV.globals.update(STATUS_CLASS=_STATUS_CLASS, BORDER_CLASS=_BORDER_CLASS)
+
+
+@functools.lru_cache(maxsize=1)
+def _scan_projects(risk_registers_path, mtime_ns):
+    """Scan the Risk_Registers folder once per directory modification time."""
+    with os.scandir(risk_registers_path) as it:
+        return tuple(
+            (e.name[len('Risk_Register_'):-len('.xlsx')], Path(e.path))
+            for e in it
+            if e.name.startswith('Risk_Register_') and e.name.endswith('.xlsx')
+            and e.is_file(follow_symlinks=False)
+        )
 
 
 def get_all_projects():
-    """Get list of all configured projects from Risk_Registers folder."""
+    """Get (project code, Risk Register path) pairs for all configured projects."""
     risk_registers_path = BASE_PATH / 'Risk_Registers'
-    projects = []
-    if risk_registers_path.exists():
-        for f in risk_registers_path.glob('Risk_Register_*.xlsx'):
-            project = f.stem.replace('Risk_Register_', '')
-            projects.append(project)
-    return projects
+    try:
+        mtime_ns = os.stat(risk_registers_path).st_mtime_ns
+    except FileNotFoundError:
+        return []
+    return list(_scan_projects(str(risk_registers_path), mtime_ns))
 
 
-def generate_monthly_report_html():
-    """Generate monthly report with dynamic content from Risk Registers."""
-    from daily_digest import get_portfolio_summary, get_critical_alerts
+@functools.lru_cache(maxsize=1)
+def _monthly_report_template():
+    """Get the compiled monthly report template."""
+    return _ENV.get_template('monthly_report.html.j2')
+
+
+def _registers_signature():
+    """Get (file name, mtime) pairs for the Risk Register files, used as a cache key."""
+    try:
+        with os.scandir(BASE_PATH / 'Risk_Registers') as it:
+            return tuple(sorted(
+                (e.name, e.stat().st_mtime_ns)
+                for e in it
+                if e.name.startswith('Risk_Register_') and e.name.endswith('.xlsx')
+            ))
+    except FileNotFoundError:
+        return ()
+
 
-    today = datetime.now().strftime('%B %d, %Y')
-    month_year = datetime.now().strftime('%B %Y')
+@functools.lru_cache(maxsize=1)
+def _portfolio_snapshot(signature):
+    """Read the portfolio summary and critical alerts once per set of register file versions."""
+    return get_portfolio_summary(), get_critical_alerts()
 
-    portfolio = get_portfolio_summary()
-    alerts = get_critical_alerts()
 
-    # Count totals
-    total_risks = sum(p.get('active_risks', 0) for p in portfolio)
+def generate_monthly_report_html(now=None):
+    """Generate monthly report with dynamic content from Risk Registers."""
+    now = now or datetime.now()
+    today = now.strftime('%B %d, %Y')
+    month_year = now.strftime('%B %Y')
+    generated = now.strftime('%Y-%m-%d %H:%M:%S')
+
+    portfolio, alerts = _portfolio_snapshot(_registers_signature())
+
+    # Count totals in a single pass over the portfolio
+    total_risks = 0
+    critical_projects = 0
+    for p in portfolio:
+        total_risks += p.get('active_risks', 0)
+        if p.get('health') == 'Critical':
+            critical_projects += 1
     total_critical = len(alerts)
-    critical_projects = len([p for p in portfolio if p.get('health') == 'Critical'])
     total_projects = len(portfolio)
 
-    # Generate critical alerts HTML
-    alerts_html = ""
-    for alert in alerts[:5]:  # Top 5 critical alerts
-        alerts_html += f"""
-        <div class="critical-alert">
-            <h3>{alert.get('risk_id', 'N/A')}: {alert.get('title', 'Critical Risk')}</h3>
-            <p><strong>Project:</strong> {alert.get('project', 'N/A')}</p>
-            <p>{alert.get('description', '')[:200]}...</p>
-        </div>
-        """
-
-    # Generate project sections HTML
-    projects_html = ""
-    for p in portfolio:
-        health = p.get('health', 'Unknown')
-        status_class = 'status-critical' if health == 'Critical' else 'status-at-risk' if health == 'At Risk' else 'status-on-track'
-        border_class = 'critical' if health in ['Critical', 'At Risk'] else ''
-
-        projects_html += f"""
-        <div class="project-section {border_class}">
-            <h3>{p.get('code', 'Unknown')} <span class="status-badge {status_class}">{health.upper()}</span></h3>
-            <p><strong>Active Risks:</strong> {p.get('active_risks', 0)} |
-               <strong>Open Tasks:</strong> {p.get('open_tasks', 0)} |
-               <strong>Overdue:</strong> {p.get('overdue_tasks', 0)}</p>
-        </div>
-        """
-
-    html = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <style>
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            line-height: 1.6;
-            color: #333;
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 20px;
-        }}
-        .header {{
-            background: linear-gradient(135deg, #1e3a5f 0%, #2d5a87 100%);
-            color: white;
-            padding: 30px;
-            border-radius: 8px 8px 0 0;
-        }}
-        .header h1 {{
-            margin: 0;
-            font-size: 28px;
-        }}
-        .header .subtitle {{
-            opacity: 0.9;
-            font-size: 16px;
-            margin-top: 5px;
-        }}
-        .executive-summary {{
-            background: #fff3cd;
-            border: 2px solid #ffc107;
-            border-radius: 0;
-            padding: 25px;
-            margin: 0;
-        }}
-        .executive-summary h2 {{
-            color: #856404;
-            margin-top: 0;
-            font-size: 20px;
-            border-bottom: 2px solid #ffc107;
-            padding-bottom: 10px;
-        }}
-        .critical-alert {{
-            background: #dc3545;
-            color: white;
-            padding: 20px;
-            margin: 15px 0;
-            border-radius: 6px;
-        }}
-        .critical-alert h3 {{
-            margin: 0 0 10px 0;
-            font-size: 16px;
-        }}
-        .critical-alert p {{
-            margin: 5px 0;
-            font-size: 14px;
-        }}
-        .key-metrics {{
-            display: flex;
-            gap: 15px;
-            margin: 20px 0;
-            flex-wrap: wrap;
-        }}
-        .metric {{
-            background: white;
-            border: 1px solid #dee2e6;
-            border-radius: 8px;
-            padding: 15px 20px;
-            min-width: 120px;
-            text-align: center;
-        }}
-        .metric .value {{
-            font-size: 32px;
-            font-weight: bold;
-            color: #1e3a5f;
-        }}
-        .metric .label {{
-            font-size: 12px;
-            color: #666;
-            text-transform: uppercase;
-        }}
-        .metric.critical .value {{
-            color: #dc3545;
-        }}
-        .section {{
-            background: #f8f9fa;
-            border: 1px solid #e9ecef;
-            padding: 25px;
-            margin-top: 20px;
-        }}
-        .section h2 {{
-            color: #1e3a5f;
-            font-size: 18px;
-            margin-top: 0;
-            padding-bottom: 10px;
-            border-bottom: 2px solid #2d5a87;
-        }}
-        .project-section {{
-            background: white;
-            border-radius: 8px;
-            padding: 20px;
-            margin: 15px 0;
-            border-left: 4px solid #2d5a87;
-        }}
-        .project-section.critical {{
-            border-left-color: #dc3545;
-        }}
-        .project-section h3 {{
-            margin: 0 0 10px 0;
-            color: #1e3a5f;
-        }}
-        .status-badge {{
-            display: inline-block;
-            padding: 3px 10px;
-            border-radius: 12px;
-            font-size: 11px;
-            font-weight: bold;
-            text-transform: uppercase;
-        }}
-        .status-critical {{
-            background: #dc3545;
-            color: white;
-        }}
-        .status-at-risk {{
-            background: #ffc107;
-            color: #333;
-        }}
-        .status-on-track {{
-            background: #28a745;
-            color: white;
-        }}
-        .footer {{
-            text-align: center;
-            color: #666;
-            font-size: 12px;
-            padding: 20px;
-            border-top: 1px solid #dee2e6;
-            margin-top: 30px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>Monthly Risk Report</h1>
-        <div class="subtitle">{month_year} | Prepared {today}</div>
-    </div>
-
-    <div class="executive-summary">
-        <h2>EXECUTIVE SUMMARY</h2>
-
-        <p><strong>Portfolio Health:</strong> {critical_projects} of {total_projects} projects require attention.</p>
-
-        {alerts_html if alerts_html else '<p>No critical alerts at this time.</p>'}
-
-        <div class="key-metrics">
-            <div class="metric critical">
-                <div class="value">{total_critical}</div>
-                <div class="label">Critical Alerts</div>
-            </div>
-            <div class="metric">
-                <div class="value">{total_risks}</div>
-                <div class="label">Active Risks</div>
-            </div>
-            <div class="metric critical">
-                <div class="value">{critical_projects}</div>
-                <div class="label">Critical Projects</div>
-            </div>
-            <div class="metric">
-                <div class="value">{total_projects}</div>
-                <div class="label">Total Projects</div>
-            </div>
-        </div>
-    </div>
-
-    <div class="section">
-        <h2>PROJECT STATUS</h2>
-        {projects_html if projects_html else '<p>No projects configured.</p>'}
-    </div>
-
-    <div class="footer">
-        <p>Monthly Risk Report | Generated {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-        <p>Risk Register spreadsheets attached for detailed review</p>
-    </div>
-</body>
-</html>
-"""
-    return html
+    return _monthly_report_template().render(
+        month_year=month_year,
+        today=today,
+        critical_projects=critical_projects,
+        total_projects=total_projects,
+        total_critical=total_critical,
+        total_risks=total_risks,
+        alerts=alerts[:5],  # Top 5 critical alerts
+        portfolio=portfolio,
+        generated=generated,
+    )
 
 
-def send_monthly_report(recipient):
-    """Send monthly report with Risk Register attachments."""
-    html_content = generate_monthly_report_html()
-    today = datetime.now().strftime('%Y-%m-%d')
-    month_year = datetime.now().strftime('%B %Y')
+def _encode_file_base64(file_path):
+    """Base64-encode a file in fixed-size blocks from a read-only memory map."""
+    parts = []
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return ''
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for offset in range(0, len(mm), ENCODE_CHUNK_SIZE):
+                parts.append(base64.encodebytes(mm[offset:offset + ENCODE_CHUNK_SIZE]).decode('ascii'))
+    return ''.join(parts)
+
+
+def _encode_attachment(file_path):
+    """
+    Encode one attachment. Returns (file_path, base64 text), with None in place
+    of the text if the file has gone away.
+    """
+    try:
+        return file_path, _encode_file_base64(file_path)
+    except FileNotFoundError:
+        return file_path, None
+
+
+def _encode_attachments(file_paths):
+    """
+    Base64-encode attachments, overlapping the file reads on a few threads.
+    The encode itself is cheap next to the rest of the send, so worker processes
+    (and their start-up cost) are not worth it.
+    """
+    if len(file_paths) < 2:
+        return [_encode_attachment(path) for path in file_paths]
+    with ThreadPoolExecutor(max_workers=min(8, len(file_paths))) as pool:
+        return list(pool.map(_encode_attachment, file_paths))
+
+
+def _xlsx_attachment(encoded, filename):
+    """Build an XLSX attachment from an already base64-encoded payload."""
+    attachment = MIMEApplication(encoded, _subtype=XLSX_SUBTYPE, _encoder=encoders.encode_noop)
+    attachment['Content-Transfer-Encoding'] = 'base64'
+    attachment.add_header('Content-Disposition', 'attachment', filename=filename)
+    return attachment
+
+
+def _zip_attachment(projects, today):
+    """
+    Bundle the Risk Registers into one ZIP attachment. XLSX files are already
+    deflate-compressed, so they are stored rather than compressed again.
+    """
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_STORED) as zf:
+        for file_path, project in projects.items():
+            try:
+                zf.write(file_path, arcname=f'Risk_Register_{project}_{today}.xlsx')
+            except FileNotFoundError:
+                continue
+            print(f"[Monthly Report] Zipped: {file_path.name}")
+
+    attachment = MIMEApplication(buffer.getvalue(), _subtype='zip')
+    attachment.add_header('Content-Disposition', 'attachment', filename=f'Risk_Registers_{today}.zip')
+    return attachment
+
+
+def _build_monthly_message():
+    """
+    Build the monthly report with Risk Register attachments and serialize it once.
+    Returns the message bytes without a To: header (CRLF line endings), so the
+    base64-encoded attachments are shared by every recipient.
+    """
+    now = datetime.now()
+    html_content = generate_monthly_report_html(now)
+    today = now.strftime('%Y-%m-%d')
+    month_year = now.strftime('%B %Y')
 
     msg = MIMEMultipart('mixed')
     msg['Subject'] = f'Monthly Risk Report - {month_year}'
     msg['From'] = EMAIL_FROM
-    msg['To'] = recipient
 
     # HTML content
     msg_alternative = MIMEMultipart('alternative')
@@ -284,32 +222,54 @@ def send_monthly_report(recipient):
     msg.attach(msg_alternative)
 
     # Attach Risk Register files
-    risk_registers_path = BASE_PATH / 'Risk_Registers'
-    projects = get_all_projects()
-
-    for project in projects:
-        file_path = risk_registers_path / f'Risk_Register_{project}.xlsx'
-        if file_path.exists():
-            with open(file_path, 'rb') as f:
-                attachment = MIMEApplication(f.read(), _subtype='vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-                attachment.add_header('Content-Disposition', 'attachment', filename=f'Risk_Register_{project}_{today}.xlsx')
-                msg.attach(attachment)
-                print(f"[Monthly Report] Attached: Risk_Register_{project}.xlsx")
-
-    # Send email
-    with smtplib.SMTP(SMTP_SERVER, SMTP_PORT) as server:
-        server.starttls()
-        server.login(EMAIL_FROM, EMAIL_PASSWORD)
-        server.sendmail(EMAIL_FROM, [recipient], msg.as_string())
-
-    print(f"[Monthly Report] Email sent successfully to {recipient}")
+    projects = {path: project for project, path in get_all_projects()}
+
+    if ZIP_ATTACHMENTS:
+        if projects:
+            msg.attach(_zip_attachment(projects, today))
+    else:
+        for file_path, encoded in _encode_attachments(list(projects)):
+            if encoded is None:
+                continue
+            project = projects[file_path]
+            msg.attach(_xlsx_attachment(encoded, f'Risk_Register_{project}_{today}.xlsx'))
+            print(f"[Monthly Report] Attached: {file_path.name}")
+
+    return msg.as_bytes(policy=msg.policy.clone(linesep='\r\n'))
+
+
+def send_monthly_report_batch(recipients):
+    """Send the monthly report to each recipient over one SMTP connection."""
+    # Run the SMTP handshake (connect, STARTTLS, login) while the message is rendered and encoded
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        connecting = pool.submit(open_smtp, EMAIL_FROM, EMAIL_PASSWORD, server=SMTP_SERVER, port=SMTP_PORT)
+        message_bytes = _build_monthly_message()
+        connecting.result()
+
+    for recipient in recipients:
+        if '\r' in recipient or '\n' in recipient:
+            raise ValueError(f"Invalid recipient address: {recipient!r}")
+        message = f'To: {recipient}\r\n'.encode('utf-8') + message_bytes
+
+        # Shared, locked connection from daily_digest; retries once if the server dropped it
+        send_smtp_bytes(message, EMAIL_FROM, EMAIL_PASSWORD, [recipient], server=SMTP_SERVER, port=SMTP_PORT)
+
+        print(f"[Monthly Report] Email sent successfully to {recipient}")
+
     return True
 
 
+def send_monthly_report(recipient):
+    """Send monthly report with Risk Register attachments."""
+    return send_monthly_report_batch([recipient])
+
+
 if __name__ == '__main__':
-    import sys
-    recipient = sys.argv[1] if len(sys.argv) > 1 else os.getenv('EMAIL_TO', '')
-    if recipient:
-        send_monthly_report(recipient)
+    if len(sys.argv) > 1:
+        recipients = sys.argv[1:]
+    else:
+        recipients = [r.strip() for r in os.getenv('EMAIL_TO', '').split(',') if r.strip()]
+    if recipients:
+        send_monthly_report_batch(recipients)
     else:
         print("Error: No recipient specified. Set EMAIL_TO in .env or pass as argument.")
@@ -4,20 +4,39 @@ Provides REST API endpoints to process content and extract risks/tasks.
 Includes folder watcher for automatic transcript processing.
 """
 
+import functools
+import hashlib
+import heapq
+import json
 import os
+import queue
 import sys
 import threading
 import time
 import atexit
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time as dt_time, timedelta
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, request
 from dotenv import load_dotenv
-from watchdog.observers.polling import PollingObserver as Observer
-from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
+from watchdog.events import PatternMatchingEventHandler
 from apscheduler.schedulers.background import BackgroundScheduler
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from python_calamine import CalamineWorkbook
+except ImportError:
+    CalamineWorkbook = None
+
 from process import process_content
-from daily_digest import send_digest_email, preview_digest
+from daily_digest import send_digest_email, preview_digest, send_smtp_message
 
 
 # File reading utilities
@@ -27,11 +46,54 @@ def read_text_file(file_path):
         return f.read()
 
 
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+
 def read_docx_file(file_path):
-    """Read contents of a .docx file."""
-    from docx import Document
-    doc = Document(file_path)
-    return '\n'.join([para.text for para in doc.paragraphs])
+    """
+    Read contents of a .docx file, one line per body paragraph.
+    Streams word/document.xml with lxml so memory stays flat for large documents;
+    falls back to python-docx if lxml is unavailable.
+    """
+    try:
+        from lxml import etree
+    except ImportError:
+        from docx import Document
+        doc = Document(file_path)
+        return '\n'.join([para.text for para in doc.paragraphs])
+
+    import zipfile
+
+    body_tag = _W + 'body'
+    paragraphs = []
+    with zipfile.ZipFile(file_path) as z, z.open('word/document.xml') as f:
+        for _, el in etree.iterparse(f, events=('end',), tag=(_W + 'p', _W + 'tbl')):
+            parent = el.getparent()
+            if parent is None or parent.tag != body_tag:
+                continue  # nested in a table or text box; handled with its top-level block
+            if el.tag == _W + 'p':
+                paragraphs.append(_docx_paragraph_text(el))
+            # Free each top-level block once read (tables are skipped, like doc.paragraphs)
+            el.clear()
+            while el.getprevious() is not None:
+                del parent[0]
+    return '\n'.join(paragraphs)
+
+
+def _docx_paragraph_text(paragraph):
+    """Get a paragraph's run text, matching python-docx for text, tabs and line breaks."""
+    parts = []
+    for el in paragraph.iter(_W + 't', _W + 'tab', _W + 'br', _W + 'cr'):
+        tag = el.tag
+        if tag == _W + 't':
+            parts.append(el.text or '')
+        elif el.getparent().tag != _W + 'r':
+            continue  # tab stop definitions in paragraph properties
+        elif tag == _W + 'tab':
+            parts.append('\t')
+        elif tag == _W + 'cr' or el.get(_W + 'type', 'textWrapping') == 'textWrapping':
+            parts.append('\n')
+    return ''.join(parts)
 
 
 def read_file_contents(file_path):
@@ -45,36 +107,134 @@ def read_file_contents(file_path):
         raise ValueError(f"Unsupported file type: {ext}")
 
 
-class TranscriptHandler(FileSystemEventHandler):
+class TranscriptHandler(PatternMatchingEventHandler):
     """Watches for new transcript files and processes them."""
 
-    SUPPORTED_EXTENSIONS = {'.txt', '.md', '.docx'}
-
-    def __init__(self, project_code):
+    SUPPORTED_EXTENSIONS = ('.txt', '.md', '.docx')
+    # Editor swap/temp files, Office lock files (~$name.docx) and hidden files
+    IGNORE_PATTERNS = ['*.tmp', '*.swp', '*~', '~$*', '.*']
+    MAX_REMEMBERED_FILES = 4096   # LRU bound for processed files and recent events
+    DEBOUNCE_SECONDS = 2.0        # repeat events for an unchanged file inside this window are ignored
+    STABLE_POLL_SECONDS = 0.2     # file size must hold steady for one poll interval
+    STABLE_TIMEOUT_SECONDS = 30.0
+    BATCH_LATENCY_SECONDS = 0.2   # a burst of events ends after this long with no new event
+
+    # Events go through one queue and worker thread per project, so the observer's dispatch
+    # thread never blocks on a slow transcript run, and a file still being written or a long
+    # extraction in one project does not hold up the others. A project's files (one register)
+    # are still handled one at a time.
+    _events = {}     # project code -> queue.Queue
+    _workers = {}    # project code -> worker thread
+    _worker_lock = threading.Lock()
+    # project code -> {(resolved path, mtime_ns) -> time.monotonic() when last handled};
+    # each project's LRU is only touched by that project's worker
+    _recent_events = {}
+
+    def __init__(self, project_code, suffixes=SUPPORTED_EXTENSIONS):
+        # Events for other files and for directories are dropped by watchdog before dispatch
+        super().__init__(
+            patterns=[f'*{suffix}' for suffix in suffixes],
+            ignore_patterns=self.IGNORE_PATTERNS,
+            ignore_directories=True,
+            case_sensitive=False,
+        )
         self.project_code = project_code
-        self.processed_files = set()
+        self.processed_files = OrderedDict()   # (path, size) -> None, oldest first
+
+    @classmethod
+    def _remember(cls, lru, key, value=None):
+        """Insert or refresh an LRU entry, evicting the oldest past the size bound."""
+        lru[key] = value
+        lru.move_to_end(key)
+        if len(lru) > cls.MAX_REMEMBERED_FILES:
+            lru.popitem(last=False)
+
+    def _wait_until_stable(self, file_path):
+        """Wait until the file size stops changing. Returns the size, or None if the file went away."""
+        deadline = time.monotonic() + self.STABLE_TIMEOUT_SECONDS
+        try:
+            size = file_path.stat().st_size
+            while time.monotonic() < deadline:
+                time.sleep(self.STABLE_POLL_SECONDS)
+                new_size = file_path.stat().st_size
+                if new_size == size:
+                    break
+                size = new_size
+        except FileNotFoundError:
+            return None
+        return size
 
     def on_created(self, event):
-        """Handle new file creation."""
-        if event.is_directory:
-            return
+        """Queue a new file for this project's worker thread."""
+        self._ensure_worker(self.project_code).put((self, Path(event.src_path)))
+
+    @classmethod
+    def _ensure_worker(cls, project_code):
+        """Start the worker thread for a project, if it isn't running. Returns its event queue."""
+        with cls._worker_lock:
+            events = cls._events.get(project_code)
+            if events is None:
+                events = cls._events[project_code] = queue.Queue()
+            worker = cls._workers.get(project_code)
+            if worker is None or not worker.is_alive():
+                worker = threading.Thread(target=cls._drain_events, args=(events,),
+                                          name=f'transcript-worker-{project_code}', daemon=True)
+                cls._workers[project_code] = worker
+                worker.start()
+            return events
+
+    @classmethod
+    def _drain_events(cls, events):
+        """Collect each burst of a project's events, then handle every distinct file in it once."""
+        while True:
+            batch = {}
+            handler, file_path = events.get()
+            batch[file_path] = handler
+            while True:
+                try:
+                    handler, file_path = events.get(timeout=cls.BATCH_LATENCY_SECONDS)
+                except queue.Empty:
+                    break
+                batch[file_path] = handler
 
-        file_path = Path(event.src_path)
+            for file_path, handler in batch.items():
+                try:
+                    handler.handle_file(file_path)
+                except Exception as e:
+                    print(f"[Folder Watcher] Error handling {file_path.name}: {e}", flush=True)
 
-        # Check if file type is supported
-        if file_path.suffix.lower() not in self.SUPPORTED_EXTENSIONS:
+    def handle_file(self, file_path):
+        """Process a new file once it has finished being written."""
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except FileNotFoundError:
             return
 
-        # Avoid processing the same file twice
-        if str(file_path) in self.processed_files:
+        # Drop repeat notifications for an unchanged file (create, modify, close-write);
+        # a new mtime means the file really changed and gets handled again
+        path_key = str(file_path)
+        event_key = (str(file_path.resolve()), mtime_ns)
+        recent_events = self._recent_events.setdefault(self.project_code, OrderedDict())
+        now = time.monotonic()
+        last_seen = recent_events.get(event_key)
+        self._remember(recent_events, event_key, now)
+        if last_seen is not None and now - last_seen < self.DEBOUNCE_SECONDS:
             return
 
         # Wait for file to be fully written
-        time.sleep(1)
+        size = self._wait_until_stable(file_path)
+        if size is None:
+            return
+
+        # Avoid processing the same file twice
+        key = (path_key, size)
+        if key in self.processed_files:
+            self.processed_files.move_to_end(key)
+            return
 
-        self.process_transcript(file_path)
+        self.process_transcript(file_path, key)
 
-    def process_transcript(self, file_path):
+    def process_transcript(self, file_path, key=None):
         """Process a transcript file."""
         print(f"\n[Folder Watcher] New file detected: {file_path.name}", flush=True)
 
@@ -96,7 +256,7 @@ class TranscriptHandler(FileSystemEventHandler):
                 source_name=file_path.name
             )
 
-            self.processed_files.add(str(file_path))
+            self._remember(self.processed_files, key or (str(file_path), file_path.stat().st_size))
 
             if result['success']:
                 print(f"[Folder Watcher] Successfully processed {file_path.name}", flush=True)
@@ -114,21 +274,43 @@ class TranscriptHandler(FileSystemEventHandler):
             print(f"[Folder Watcher] Error reading {file_path.name}: {e}", flush=True)
 
 
-def start_folder_watcher(watch_path, project_code):
-    """Start the folder watcher in a background thread."""
-    watch_path = Path(watch_path)
+def create_observer():
+    """Create a watchdog observer: native OS events by default, polling if WATCHDOG_POLLING is set."""
+    # Polling is for shares where native events don't fire (e.g. network drives)
+    if os.getenv('WATCHDOG_POLLING', '').strip().lower() in ('1', 'true', 'yes'):
+        return PollingObserver()
+    return Observer()
 
-    if not watch_path.exists():
-        watch_path.mkdir(parents=True, exist_ok=True)
-        print(f"[Folder Watcher] Created directory: {watch_path}")
 
-    event_handler = TranscriptHandler(project_code)
-    observer = Observer()
+def _ensure_directory(path):
+    """Create a folder (and its parents) if missing, in one mkdir call when it already exists."""
+    try:
+        os.mkdir(path)
+    except FileExistsError:
+        return
+    except FileNotFoundError:
+        path.mkdir(parents=True, exist_ok=True)
+    print(f"[Folder Watcher] Created directory: {path}")
+
+
+def start_folder_watcher(watch_path, project_code, suffixes=TranscriptHandler.SUPPORTED_EXTENSIONS, observer=None):
+    """
+    Watch a folder for new transcripts, reacting only to files with the given suffixes.
+    The watch is added to observer (one observer thread can serve every project); if none
+    is given, a new observer is created and started. Returns the observer.
+    """
+    watch_path = Path(watch_path)
+    _ensure_directory(watch_path)
+
+    event_handler = TranscriptHandler(project_code, suffixes)
+    if observer is None:
+        observer = create_observer()
+        observer.start()
     observer.schedule(event_handler, str(watch_path), recursive=False)
-    observer.start()
 
-    print(f"[Folder Watcher] Watching {watch_path} for new transcripts...")
-    print(f"[Folder Watcher] Supported files: .txt, .md, .docx")
+    use_polling = isinstance(observer, PollingObserver)
+    print(f"[Folder Watcher] Watching {watch_path} for new transcripts ({'polling' if use_polling else 'native events'})...")
+    print(f"[Folder Watcher] Supported files: {', '.join(suffixes)}")
 
     return observer
 
@@ -155,8 +337,13 @@ def get_base_path():
 BASE_PATH = get_base_path()
 print(f"[Server] Data directory: {BASE_PATH}")
 
+# Paths used on every request, resolved once at import
+SCRIPT_DIR = Path(__file__).parent.resolve()
+RISK_REGISTERS_PATH = BASE_PATH / 'Risk_Registers'
+ICS_FOLDER = SCRIPT_DIR / 'ics_files'
+
 # Ensure required directories exist
-(BASE_PATH / 'Risk_Registers').mkdir(parents=True, exist_ok=True)
+RISK_REGISTERS_PATH.mkdir(parents=True, exist_ok=True)
 
 app = Flask(__name__)
 
@@ -165,10 +352,65 @@ from flask_cors import CORS
 CORS(app, origins=['http://localhost:3000', 'http://localhost:5173', 'file://', 'null'])
 
 
+if orjson is not None:
+    from flask.json.provider import DefaultJSONProvider
+    from werkzeug.http import http_date
+
+    # Same wire format as Flask's default provider: keys sorted, and dates and
+    # datetimes as RFC 822 HTTP dates (orjson would write ISO 8601)
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+
+    def _orjson_default(obj):
+        """Encode what orjson passes through the way Flask's default provider does."""
+        if isinstance(obj, date):
+            return http_date(obj)
+        if hasattr(obj, '__html__'):
+            return str(obj.__html__())
+        return str(obj)
+
+    class OrjsonProvider(DefaultJSONProvider):
+        """
+        Flask JSON provider backed by orjson. Parses request bodies (request.get_json)
+        and encodes any dict/list view result or jsonify call in C.
+        """
+
+        def dumps(self, obj, **kwargs):
+            return orjson.dumps(obj, option=_ORJSON_OPTIONS, default=_orjson_default).decode('utf-8')
+
+        def loads(self, s, **kwargs):
+            return orjson.loads(s)
+
+        def response(self, *args, **kwargs):
+            obj = self._prepare_response_obj(args, kwargs)
+            return self._app.response_class(
+                orjson.dumps(obj, option=_ORJSON_OPTIONS, default=_orjson_default),
+                mimetype=self.mimetype,
+            )
+
+    app.json = OrjsonProvider(app)
+
+
+def _dumps(obj):
+    """Encode obj as JSON bytes, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=_ORJSON_OPTIONS, default=_orjson_default)
+    return app.json.dumps(obj).encode('utf-8')
+
+
+def _json(obj, status=200):
+    """Build a JSON response (replacement for flask.jsonify)."""
+    return app.response_class(_dumps(obj), status=status, mimetype='application/json')
+
+
+# Liveness probes hit /health often; its body never changes, so encode it once
+_HEALTH_BODY = _dumps({"status": "healthy", "service": "risk-management-system"})
+_HEALTH_HEADERS = {'Content-Type': 'application/json'}
+
+
 @app.route('/health', methods=['GET'])
 def health_check():
     """Health check endpoint."""
-    return jsonify({"status": "healthy", "service": "risk-management-system"})
+    return _HEALTH_BODY, 200, _HEALTH_HEADERS
 
 
 @app.route('/api/settings', methods=['GET'])
@@ -191,7 +433,7 @@ def get_settings():
         'IMAP_PORT': os.getenv('IMAP_PORT', '993'),
         'IMAP_PASSWORD': mask_key(os.getenv('IMAP_PASSWORD', '')),
     }
-    return jsonify({"success": True, "settings": settings})
+    return _json({"success": True, "settings": settings})
 
 
 def mask_key(value):
@@ -271,7 +513,7 @@ IMAP_PASSWORD={IMAP_PASSWORD}
     if 'PROJECT_NAMES' in data:
         create_project_folders(data['PROJECT_NAMES'])
 
-    return jsonify({"success": True, "message": "Settings saved. Restart app for some changes to take effect."})
+    return _json({"success": True, "message": "Settings saved. Restart app for some changes to take effect."})
 
 
 def create_project_folders(project_names_str):
@@ -296,7 +538,7 @@ def create_project_folders(project_names_str):
         (project_folder / "3 - Deliverables").mkdir(exist_ok=True)
 
         # Also create Risk_Registers folder for backward compatibility
-        (BASE_PATH / "Risk_Registers" / project).mkdir(parents=True, exist_ok=True)
+        (RISK_REGISTERS_PATH / project).mkdir(parents=True, exist_ok=True)
 
     print(f"[Settings] Created folder structure for {len(projects)} projects")
 
@@ -309,14 +551,14 @@ def test_connection():
     if service == 'anthropic':
         api_key = os.getenv('ANTHROPIC_API_KEY', '')
         if not api_key or api_key.startswith('****'):
-            return jsonify({"success": False, "error": "API key not configured"})
+            return _json({"success": False, "error": "API key not configured"})
         try:
             import anthropic
             client = anthropic.Anthropic(api_key=api_key)
             # Simple test - just check if client can be created
-            return jsonify({"success": True, "message": "Anthropic API key is valid"})
+            return _json({"success": True, "message": "Anthropic API key is valid"})
         except Exception as e:
-            return jsonify({"success": False, "error": str(e)})
+            return _json({"success": False, "error": str(e)})
 
     elif service == 'email':
         import smtplib
@@ -326,15 +568,15 @@ def test_connection():
         password = os.getenv('EMAIL_PASSWORD', '')
 
         if not all([server, email_from, password]):
-            return jsonify({"success": False, "error": "Email settings not fully configured"})
+            return _json({"success": False, "error": "Email settings not fully configured"})
 
         try:
             with smtplib.SMTP(server, port, timeout=10) as smtp:
                 smtp.starttls()
                 smtp.login(email_from, password)
-            return jsonify({"success": True, "message": "Email connection successful"})
+            return _json({"success": True, "message": "Email connection successful"})
         except Exception as e:
-            return jsonify({"success": False, "error": str(e)})
+            return _json({"success": False, "error": str(e)})
 
     elif service == 'microsoft':
         client_id = os.getenv('MS_CLIENT_ID', '')
@@ -342,7 +584,7 @@ def test_connection():
         client_secret = os.getenv('MS_CLIENT_SECRET', '')
 
         if not all([client_id, tenant_id, client_secret]):
-            return jsonify({"success": False, "error": "Microsoft Graph not fully configured"})
+            return _json({"success": False, "error": "Microsoft Graph not fully configured"})
 
         try:
             import requests
@@ -354,29 +596,29 @@ def test_connection():
                 'grant_type': 'client_credentials'
             }, timeout=10)
             if response.status_code == 200:
-                return jsonify({"success": True, "message": "Microsoft Graph connection successful"})
+                return _json({"success": True, "message": "Microsoft Graph connection successful"})
             else:
-                return jsonify({"success": False, "error": f"Auth failed: {response.text}"})
+                return _json({"success": False, "error": f"Auth failed: {response.text}"})
         except Exception as e:
-            return jsonify({"success": False, "error": str(e)})
+            return _json({"success": False, "error": str(e)})
 
     elif service == 'ngrok':
         token = os.getenv('NGROK_AUTH_TOKEN', '')
         if not token or token.startswith('****'):
-            return jsonify({"success": False, "error": "ngrok token not configured"})
+            return _json({"success": False, "error": "ngrok token not configured"})
         # ngrok token validation would require actually starting ngrok
-        return jsonify({"success": True, "message": "ngrok token is configured (not validated)"})
+        return _json({"success": True, "message": "ngrok token is configured (not validated)"})
 
-    return jsonify({"success": False, "error": "Unknown service"})
+    return _json({"success": False, "error": "Unknown service"})
 
 
 @app.route('/api/data-path', methods=['GET'])
 def get_data_path():
     """Get the data folder path for user reference."""
-    return jsonify({
+    return _json({
         "success": True,
         "path": str(BASE_PATH),
-        "projects_path": str(BASE_PATH / "Risk_Registers"),
+        "projects_path": str(RISK_REGISTERS_PATH),
         "reports_path": str(BASE_PATH / "0 - Reports")
     })
 
@@ -385,17 +627,17 @@ def get_data_path():
 def upload_logo():
     """Upload a company logo."""
     if 'logo' not in request.files:
-        return jsonify({"success": False, "error": "No file provided"}), 400
+        return _json({"success": False, "error": "No file provided"}), 400
 
     file = request.files['logo']
     if file.filename == '':
-        return jsonify({"success": False, "error": "No file selected"}), 400
+        return _json({"success": False, "error": "No file selected"}), 400
 
     # Validate file type
     allowed_extensions = {'.png', '.jpg', '.jpeg', '.gif', '.svg', '.webp'}
     ext = Path(file.filename).suffix.lower()
     if ext not in allowed_extensions:
-        return jsonify({"success": False, "error": f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"}), 400
+        return _json({"success": False, "error": f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"}), 400
 
     try:
         # Save to webapp public folder (for React/Vite dev) and build folder (for Electron)
@@ -410,12 +652,9 @@ def upload_logo():
         # If it's not PNG, we'll just keep the original format
         logo_filename = 'logo' + ext if ext != '.png' else 'logo.png'
 
-        # Get the directory where this script is running from
-        script_dir = Path(__file__).parent.resolve()
-
         # Try multiple potential locations
         save_locations = [
-            script_dir / 'dashboard' / 'public' / 'logo.png',  # Dev mode
+            SCRIPT_DIR / 'dashboard' / 'public' / 'logo.png',  # Dev mode
             BASE_PATH / 'logo.png',  # User data folder
         ]
 
@@ -430,17 +669,17 @@ def upload_logo():
                 print(f"[Logo] Could not save to {loc}: {e}")
 
         if not saved_to:
-            return jsonify({"success": False, "error": "Could not save logo to any location"}), 500
+            return _json({"success": False, "error": "Could not save logo to any location"}), 500
 
         print(f"[Logo] Saved to: {saved_to}")
-        return jsonify({
+        return _json({
             "success": True,
             "message": "Logo uploaded successfully",
             "saved_to": saved_to
         })
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/logo.png', methods=['GET'])
@@ -451,14 +690,38 @@ def serve_logo():
     # Check multiple locations for the logo
     possible_paths = [
         BASE_PATH / 'logo.png',
-        Path(__file__).parent / 'dashboard' / 'public' / 'logo.png',
+        SCRIPT_DIR / 'dashboard' / 'public' / 'logo.png',
     ]
 
     for path in possible_paths:
         if path.exists():
             return send_file(str(path), mimetype='image/png')
 
-    return jsonify({"error": "Logo not found"}), 404
+    return _json({"error": "Logo not found"}), 404
+
+
+@functools.lru_cache(maxsize=1)
+def _pdftotext_path():
+    """Locate poppler's pdftotext binary once. Returns None if it is not installed."""
+    import shutil
+    return shutil.which('pdftotext')
+
+
+def _extract_pdf_with_pdftotext(file_path: Path):
+    """Extract all pages in one pdftotext call. Returns None if unavailable or it fails."""
+    import subprocess
+
+    exe = _pdftotext_path()
+    if not exe:
+        return None
+    try:
+        result = subprocess.run([exe, '-layout', '-q', str(file_path), '-'], capture_output=True, timeout=30)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    # Pages are separated by form feeds; join them with newlines like the other extractors
+    return result.stdout.decode('utf-8', errors='ignore').replace('\f', '\n')
 
 
 def extract_text_from_attachment(file_path: Path, extension: str) -> str:
@@ -469,9 +732,7 @@ def extract_text_from_attachment(file_path: Path, extension: str) -> str:
                 return f.read()
 
         elif extension == '.docx':
-            from docx import Document
-            doc = Document(file_path)
-            return '\n'.join([para.text for para in doc.paragraphs])
+            return read_docx_file(file_path)
 
         elif extension == '.doc':
             try:
@@ -481,7 +742,22 @@ def extract_text_from_attachment(file_path: Path, extension: str) -> str:
                 return f"[Could not extract .doc file]"
 
         elif extension == '.pdf':
+            text = _extract_pdf_with_pdftotext(file_path)
+            if text:
+                return text
             try:
+                # PyMuPDF reads the text layer in C; fall back to pure-Python PyPDF2
+                try:
+                    import pymupdf
+                except ImportError:
+                    try:
+                        # PyMuPDF before 1.24.3 only has the fitz module name
+                        import fitz as pymupdf
+                    except ImportError:
+                        pymupdf = None
+                if pymupdf is not None:
+                    with pymupdf.open(file_path) as doc:
+                        return '\n'.join(page.get_text("text") for page in doc)
                 import PyPDF2
                 with open(file_path, 'rb') as f:
                     reader = PyPDF2.PdfReader(f)
@@ -497,13 +773,17 @@ def extract_text_from_attachment(file_path: Path, extension: str) -> str:
         return f"[Error extracting {extension}: {e}]"
 
 
+# Base64 characters decoded per block when writing attachments to disk (multiple of 4)
+ATTACHMENT_DECODE_CHUNK = 64 * 1024
+
+
 def process_attachments(attachments: list) -> tuple:
     """
     Process attachments from Power Automate payload.
     Returns (extracted_text, attachment_notes) tuple.
     """
-    import base64
     import tempfile
+    from binascii import a2b_base64
 
     extracted_texts = []
     attachment_notes = []
@@ -526,23 +806,30 @@ def process_attachments(attachments: list) -> tuple:
             attachment_notes.append(f"[Attachment: {filename} - Unsupported format {extension}]")
             continue
 
+        tmp_path = None
         try:
-            # Decode base64 content
-            content_bytes = base64.b64decode(content_b64)
-
-            # Write to temp file for processing
-            with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp:
-                tmp.write(content_bytes)
-                tmp_path = Path(tmp.name)
+            # Drop line breaks/whitespace so fixed-size blocks stay aligned to 4-char groups
+            content_b64 = ''.join(content_b64.split())
 
-            # Extract text
-            text = extract_text_from_attachment(tmp_path, extension)
+            if extension in ['.txt', '.md']:
+                # Plain text needs no temp file
+                text = a2b_base64(content_b64).decode('utf-8', errors='ignore')
+                text = text.replace('\r\n', '\n').replace('\r', '\n')
+            else:
+                # Decode straight into the temp file in blocks rather than holding all bytes in memory
+                with tempfile.NamedTemporaryFile(delete=False, suffix=extension) as tmp:
+                    tmp_path = Path(tmp.name)
+                    for start in range(0, len(content_b64), ATTACHMENT_DECODE_CHUNK):
+                        tmp.write(a2b_base64(content_b64[start:start + ATTACHMENT_DECODE_CHUNK]))
 
-            # Clean up temp file
-            tmp_path.unlink()
+                # Extract text
+                text = extract_text_from_attachment(tmp_path, extension)
 
             if text and len(text.strip()) > 10:
-                extracted_texts.append(f"\n\n--- ATTACHMENT: {filename} ---\n{text}")
+                # Keep header and text as separate pieces; they are joined once at the end
+                if extracted_texts:
+                    extracted_texts.append('\n')
+                extracted_texts.extend(("\n\n--- ATTACHMENT: ", filename, " ---\n", text))
                 attachment_notes.append(f"[Processed attachment: {filename} ({len(text)} chars)]")
                 print(f"[Process] Extracted {len(text)} chars from {filename}")
             else:
@@ -551,8 +838,12 @@ def process_attachments(attachments: list) -> tuple:
         except Exception as e:
             attachment_notes.append(f"[Attachment: {filename} - Error: {str(e)}]")
             print(f"[Process] Error processing attachment {filename}: {e}")
+        finally:
+            # Clean up temp file, including when extraction failed
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
 
-    return '\n'.join(extracted_texts), attachment_notes
+    return ''.join(extracted_texts), attachment_notes
 
 
 @app.route('/process', methods=['POST'])
@@ -590,7 +881,7 @@ def process_endpoint():
     """
     # Validate request
     if not request.is_json:
-        return jsonify({
+        return _json({
             "success": False,
             "error": "Request must be JSON",
             "changes": []
@@ -603,7 +894,7 @@ def process_endpoint():
     missing_fields = [f for f in required_fields if f not in data or not data[f]]
 
     if missing_fields:
-        return jsonify({
+        return _json({
             "success": False,
             "error": f"Missing required fields: {', '.join(missing_fields)}",
             "changes": []
@@ -612,21 +903,21 @@ def process_endpoint():
     # Validate source_type
     valid_source_types = ['email', 'meeting', 'document', 'chat', 'other', 'email_attachment']
     if data['source_type'] not in valid_source_types:
-        return jsonify({
+        return _json({
             "success": False,
             "error": f"Invalid source_type. Must be one of: {', '.join(valid_source_types)}",
             "changes": []
         }), 400
 
     # Process attachments if provided
-    combined_content = data['content']
+    attachment_text = ''
     attachment_notes = []
 
     if data.get('attachments'):
         print(f"[Process] Processing {len(data['attachments'])} attachments...")
         attachment_text, attachment_notes = process_attachments(data['attachments'])
-        if attachment_text:
-            combined_content = data['content'] + attachment_text
+
+    combined_content = data['content'] + attachment_text if attachment_text else data['content']
 
     # Process the content
     result = process_content(
@@ -648,27 +939,20 @@ def process_endpoint():
         "attachments_processed": attachment_notes
     }
 
-    return jsonify(response), status_code
+    return _json(response), status_code
 
 
 @app.route('/projects', methods=['GET'])
 def list_projects():
     """List available projects based on existing Risk Register files."""
-    from pathlib import Path
-
-    risk_registers_path = BASE_PATH / "Risk_Registers"
-
-    projects = []
-    if risk_registers_path.exists():
-        for file in risk_registers_path.glob("Risk_Register_*.xlsx"):
-            # Extract project code from filename
-            project_code = file.stem.replace("Risk_Register_", "")
-            projects.append({
-                "code": project_code,
-                "risk_register": str(file)
-            })
+    registers, _ = _scan_risk_registers()
+
+    projects = [
+        {"code": project_code, "risk_register": path}
+        for project_code, path in registers
+    ]
 
-    return jsonify({
+    return _json({
         "projects": projects,
         "count": len(projects)
     })
@@ -682,17 +966,17 @@ def send_digest_endpoint():
     try:
         success = send_digest_email(project)
         if success:
-            return jsonify({
+            return _json({
                 "success": True,
                 "message": f"Digest email sent for project {project}"
             })
         else:
-            return jsonify({
+            return _json({
                 "success": False,
                 "error": "Failed to send email. Check EMAIL_PASSWORD in .env"
             }), 500
     except Exception as e:
-        return jsonify({
+        return _json({
             "success": False,
             "error": str(e)
         }), 500
@@ -708,7 +992,7 @@ def preview_digest_endpoint():
         html = generate_html_email(project)
         return html, 200, {'Content-Type': 'text/html'}
     except Exception as e:
-        return jsonify({
+        return _json({
             "success": False,
             "error": str(e)
         }), 500
@@ -716,150 +1000,406 @@ def preview_digest_endpoint():
 
 # ============== Dashboard API Endpoints ==============
 
-def read_excel_data(project_code='HB'):
-    """Read all data from the Risk Register Excel file."""
-    import openpyxl
-    from datetime import datetime
+# Parsed Risk Register data keyed by file path -> ((mtime_ns, size), data)
+_excel_cache = {}
+# Next free task slot keyed by file path -> ((mtime_ns, size), next task number, next row)
+_task_slot_cache = {}
+_excel_cache_lock = threading.Lock()
+
+
+def _file_version(file_path):
+    """Get the (mtime_ns, size) pair used to detect changes to a Risk Register."""
+    st = file_path.stat()
+    return (st.st_mtime_ns, st.st_size)
+
+
+# Parsed registers are also saved here as JSON, so a restarted server skips the openpyxl
+# parse. JSON rather than pickle: the folder may be synced or shared, and loading a
+# cache file must never run code.
+EXCEL_CACHE_DIR = BASE_PATH / '.cache'
+# Bump when the structure returned by _load_excel_data changes, to ignore old cache files
+EXCEL_CACHE_FORMAT = 2
+
+# Cell types JSON has no type for, tagged so they come back as the same type
+_TEMPORAL_TAGS = (
+    (datetime, '__datetime__', datetime.fromisoformat),
+    (date, '__date__', date.fromisoformat),
+    (dt_time, '__time__', dt_time.fromisoformat),
+)
+_TEMPORAL_PARSERS = {tag: parse for _, tag, parse in _TEMPORAL_TAGS}
+
+
+def _encode_cache_value(value):
+    """json.dumps default hook: tag datetimes, dates and times; anything else is stored as text."""
+    for cls, tag, _ in _TEMPORAL_TAGS:
+        if isinstance(value, cls):
+            return {tag: value.isoformat()}
+    if isinstance(value, timedelta):
+        return {'__timedelta__': value.total_seconds()}
+    return str(value)
+
+
+def _decode_cache_object(obj):
+    """json.loads object hook: turn tagged values back into datetimes, dates, times and timedeltas."""
+    if len(obj) == 1:
+        (tag, value), = obj.items()
+        parse = _TEMPORAL_PARSERS.get(tag)
+        if parse is not None:
+            return parse(value)
+        if tag == '__timedelta__':
+            return timedelta(seconds=value)
+    return obj
+
+
+def _disk_cache_path(file_path):
+    """Get the JSON file holding the parsed data for a Risk Register."""
+    digest = hashlib.blake2b(str(file_path).encode('utf-8'), digest_size=16).hexdigest()
+    return EXCEL_CACHE_DIR / f'excel_{digest}.json'
+
+
+def _read_disk_cache(file_path, version):
+    """Get cached data for a Risk Register if it was parsed from this file version, else None."""
+    try:
+        with open(_disk_cache_path(file_path), 'r', encoding='utf-8') as f:
+            cached = json.load(f, object_hook=_decode_cache_object)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        # Unreadable, truncated or not JSON; it is rewritten after the next parse
+        print(f"[Excel Cache] Ignoring unreadable cache for {file_path.name}: {e}")
+        return None
+    if not isinstance(cached, dict) or cached.get('format') != EXCEL_CACHE_FORMAT:
+        return None
+    if cached.get('version') != list(version) or not isinstance(cached.get('data'), dict):
+        return None
+    return cached['data']
+
+
+def _write_disk_cache(file_path, version, data):
+    """Save parsed Risk Register data as JSON, replacing any older version atomically."""
+    cache_path = _disk_cache_path(file_path)
+    tmp_path = cache_path.with_name(f'{cache_path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    payload = {'format': EXCEL_CACHE_FORMAT, 'version': list(version), 'data': data}
+    try:
+        EXCEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, default=_encode_cache_value, separators=(',', ':'))
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        print(f"[Excel Cache] Could not write cache for {file_path.name}: {e}")
+        try:
+            tmp_path.unlink()
+        except OSError:
+            pass
 
-    file_path = BASE_PATH / 'Risk_Registers' / f'Risk_Register_{project_code}.xlsx'
 
-    if not file_path.exists():
+def invalidate_excel_cache(file_path):
+    """Drop cached data for a Risk Register after it has been written."""
+    with _excel_cache_lock:
+        _excel_cache.pop(str(file_path), None)
+
+
+def read_excel_data(project_code='HB', sheets=None):
+    """
+    Read all data from the Risk Register Excel file.
+    Parsed data is cached in memory and on disk until the file's mtime or size
+    changes; callers get their own copies of the row dicts, so they are free to
+    modify them. Pass sheets (e.g. ('risks', 'tasks')) to copy only the sheets
+    the caller uses; the other keys are left out of the result.
+    """
+    file_path = RISK_REGISTERS_PATH / f'Risk_Register_{project_code}.xlsx'
+
+    try:
+        version = _file_version(file_path)
+    except FileNotFoundError:
+        if sheets is not None:
+            return {name: [] for name in sheets}
         return {'risks': [], 'tasks': [], 'updates': []}
 
-    wb = openpyxl.load_workbook(file_path)
+    key = str(file_path)
+    with _excel_cache_lock:
+        cached = _excel_cache.get(key)
 
-    def parse_date(val):
-        if val is None:
-            return None
-        if isinstance(val, datetime):
-            return val.strftime('%Y-%m-%d')
-        return str(val)
+    if cached is not None and cached[0] == version:
+        data = cached[1]
+    else:
+        data = _read_disk_cache(file_path, version)
+        if data is None:
+            data = _load_excel_data(file_path)
+            _write_disk_cache(file_path, version, data)
+        with _excel_cache_lock:
+            _excel_cache[key] = (version, data)
 
-    # Read risks
-    risks = []
-    risk_sheet = wb['Risk Register']
-    headers = [cell.value for cell in risk_sheet[1]]
+    if sheets is None:
+        sheets = data.keys()
+    return {name: [dict(row) for row in data.get(name, ())] for name in sheets}
 
-    for row_num in range(3, risk_sheet.max_row + 1):
-        row_data = {}
-        for i, cell in enumerate(risk_sheet[row_num]):
-            if i < len(headers) and headers[i]:
-                val = cell.value
-                if headers[i] in ['Date Identified', 'Last Updated', 'Closed Date']:
-                    val = parse_date(val)
-                row_data[headers[i]] = val
-        if row_data.get('Risk ID'):
-            risks.append(row_data)
-
-    # Read tasks
-    tasks = []
-    task_sheet = wb['Tasks']
-    task_headers = [cell.value for cell in task_sheet[1]]
-
-    for row_num in range(3, task_sheet.max_row + 1):
-        row_data = {}
-        for i, cell in enumerate(task_sheet[row_num]):
-            if i < len(task_headers) and task_headers[i]:
-                val = cell.value
-                if task_headers[i] in ['Due Date', 'Created Date', 'Completed Date']:
-                    val = parse_date(val)
-                row_data[task_headers[i]] = val
-        if row_data.get('Task ID'):
-            tasks.append(row_data)
-
-    # Read update log
-    updates = []
-    update_sheet = wb['Update Log']
-    update_headers = [cell.value for cell in update_sheet[1]]
-
-    for row_num in range(3, update_sheet.max_row + 1):
+
+# Date columns per sheet, normalized to YYYY-MM-DD strings when read
+_RISK_DATE_HEADERS = frozenset(('Date Identified', 'Last Updated', 'Closed Date'))
+_TASK_DATE_HEADERS = frozenset(('Due Date', 'Created Date', 'Completed Date'))
+_MILESTONE_DATE_HEADERS = frozenset(('Baseline Date', 'Current Date'))
+
+
+def _parse_date(val):
+    """Format a cell value from a date column for JSON output."""
+    if val is None:
+        return None
+    if isinstance(val, str):
+        return val
+    if isinstance(val, date):  # also covers datetime
+        return val.isoformat()[:10]
+    return str(val)
+
+
+def _read_sheet_rows(sheet, min_row, date_headers=frozenset()):
+    """
+    Read an openpyxl worksheet into a list of dicts keyed by the header row.
+    Columns named in date_headers are normalized with _parse_date.
+    """
+    header_row = next(sheet.iter_rows(min_row=1, max_row=1, values_only=True), ())
+    return _rows_to_dicts(header_row, sheet.iter_rows(min_row=min_row, values_only=True), date_headers)
+
+
+def _rows_to_dicts(header_row, value_rows, date_headers):
+    """Turn row value sequences into dicts keyed by header_row, skipping unnamed columns."""
+    # (index, header, is_date) for every named column, computed once per sheet
+    columns = tuple((i, h, h in date_headers) for i, h in enumerate(header_row) if h)
+
+    rows = []
+    for values in value_rows:
         row_data = {}
-        for i, cell in enumerate(update_sheet[row_num]):
-            if i < len(update_headers) and update_headers[i]:
-                row_data[update_headers[i]] = cell.value
-        if row_data.get('Timestamp'):
-            updates.append(row_data)
-
-    # Read milestones (P6 baseline data)
-    milestones = []
-    if 'Milestones' in wb.sheetnames:
-        ms_sheet = wb['Milestones']
-        ms_headers = [cell.value for cell in ms_sheet[1]]
-
-        for row_num in range(2, ms_sheet.max_row + 1):
-            row_data = {}
-            for i, cell in enumerate(ms_sheet[row_num]):
-                if i < len(ms_headers) and ms_headers[i]:
-                    val = cell.value
-                    if ms_headers[i] in ['Baseline Date', 'Current Date']:
-                        val = parse_date(val)
-                    row_data[ms_headers[i]] = val
-            if row_data.get('Milestone ID') or row_data.get('Milestone'):
-                milestones.append(row_data)
-
-    wb.close()
+        n = len(values)
+        for i, header, is_date in columns:
+            val = values[i] if i < n else None
+            row_data[header] = _parse_date(val) if is_date else val
+        rows.append(row_data)
+    return rows
+
+
+def _calamine_values(values):
+    """
+    Convert a row from python-calamine to the values openpyxl would return:
+    empty cells become None, whole-number floats become int, and dates become datetimes.
+    """
+    out = []
+    for v in values:
+        t = type(v)
+        if t is str:
+            out.append(v if v else None)
+        elif t is float:
+            out.append(int(v) if v.is_integer() else v)
+        elif t is date:
+            out.append(datetime(v.year, v.month, v.day))
+        else:
+            out.append(v)
+    return out
+
+
+def _calamine_sheet_rows(wb, sheet_name, min_row, date_headers=frozenset()):
+    """Read a python-calamine sheet into a list of dicts keyed by the header row."""
+    values = wb.get_sheet_by_name(sheet_name).to_python(skip_empty_area=False)
+    if not values:
+        return []
+    header_row = _calamine_values(values[0])
+    return _rows_to_dicts(header_row, map(_calamine_values, values[min_row - 1:]), date_headers)
+
+
+def _load_excel_data_calamine(file_path):
+    """Parse a Risk Register with the Rust-based python-calamine reader."""
+    wb = CalamineWorkbook.from_path(str(file_path))
+    try:
+        risks = [
+            r for r in _calamine_sheet_rows(wb, 'Risk Register', 3, _RISK_DATE_HEADERS)
+            if r.get('Risk ID')
+        ]
+        tasks = [
+            t for t in _calamine_sheet_rows(wb, 'Tasks', 3, _TASK_DATE_HEADERS)
+            if t.get('Task ID')
+        ]
+        updates = [u for u in _calamine_sheet_rows(wb, 'Update Log', 3) if u.get('Timestamp')]
+
+        milestones = []
+        if 'Milestones' in wb.sheet_names:
+            milestones = [
+                m for m in _calamine_sheet_rows(wb, 'Milestones', 2, _MILESTONE_DATE_HEADERS)
+                if m.get('Milestone ID') or m.get('Milestone')
+            ]
+    finally:
+        wb.close()
+
     return {'risks': risks, 'tasks': tasks, 'updates': updates, 'milestones': milestones}
 
 
+def _load_excel_data(file_path):
+    """Parse risks, tasks, updates and milestones from a Risk Register workbook."""
+    if CalamineWorkbook is not None:
+        try:
+            return _load_excel_data_calamine(file_path)
+        except Exception as e:
+            print(f"[Excel] calamine could not read {file_path.name}, falling back to openpyxl: {e}")
+
+    import openpyxl
+
+    # Read-only mode streams rows from the sheet XML instead of building every cell
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        risks = [
+            r for r in _read_sheet_rows(wb['Risk Register'], 3, _RISK_DATE_HEADERS)
+            if r.get('Risk ID')
+        ]
+        tasks = [
+            t for t in _read_sheet_rows(wb['Tasks'], 3, _TASK_DATE_HEADERS)
+            if t.get('Task ID')
+        ]
+        updates = [u for u in _read_sheet_rows(wb['Update Log'], 3) if u.get('Timestamp')]
+
+        # Read milestones (P6 baseline data)
+        milestones = []
+        if 'Milestones' in wb.sheetnames:
+            milestones = [
+                m for m in _read_sheet_rows(wb['Milestones'], 2, _MILESTONE_DATE_HEADERS)
+                if m.get('Milestone ID') or m.get('Milestone')
+            ]
+    finally:
+        wb.close()
+
+    return {'risks': risks, 'tasks': tasks, 'updates': updates, 'milestones': milestones}
+
+
+# Last Risk_Registers listing: (dir mtime_ns, register files, project folders)
+_project_scan_cache = None
+
+
+def _scan_risk_registers():
+    """
+    List (project code, path) for each Risk Register file and the names of project folders.
+    The directory is only rescanned when its mtime changes (an entry was added, removed or renamed).
+    """
+    global _project_scan_cache
+    try:
+        mtime_ns = RISK_REGISTERS_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return (), ()
+
+    cached = _project_scan_cache
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1], cached[2]
+
+    registers = []
+    folders = []
+    with os.scandir(RISK_REGISTERS_PATH) as it:
+        for entry in it:
+            name = entry.name
+            if entry.is_dir():
+                if not name.startswith('.'):
+                    folders.append(name)
+            elif name.startswith('Risk_Register_') and name.endswith('.xlsx'):
+                registers.append((name[len('Risk_Register_'):-len('.xlsx')], entry.path))
+
+    _project_scan_cache = (mtime_ns, tuple(registers), tuple(folders))
+    return _project_scan_cache[1], _project_scan_cache[2]
+
+
+# Last merged project list: (PROJECT_NAMES value, register files, project folders, project codes)
+_project_list_cache = None
+
+
 def get_all_projects():
     """Get list of all project codes from settings and existing files."""
+    global _project_list_cache
+    project_names = os.getenv('PROJECT_NAMES', '')
+    registers, folders = _scan_risk_registers()
+
+    # The scan returns the same tuples until the folder changes, so an identity check is enough
+    cached = _project_list_cache
+    if (cached is not None and cached[0] == project_names
+            and cached[1] is registers and cached[2] is folders):
+        return list(cached[3])
+
     projects = set()
 
     # 1. Get from PROJECT_NAMES env var (configured in settings)
-    project_names = os.getenv('PROJECT_NAMES', '')
     if project_names:
         for name in project_names.split(','):
             name = name.strip()
             if name:
                 projects.add(name)
 
-    # 2. Get from existing Risk Register files
-    risk_registers_path = BASE_PATH / "Risk_Registers"
-    if risk_registers_path.exists():
-        for file in risk_registers_path.glob("Risk_Register_*.xlsx"):
-            project_code = file.stem.replace("Risk_Register_", "")
-            projects.add(project_code)
-        # Also check for project folders
-        for folder in risk_registers_path.iterdir():
-            if folder.is_dir() and not folder.name.startswith('.'):
-                projects.add(folder.name)
+    # 2. Get from existing Risk Register files and project folders
+    projects.update(project_code for project_code, _ in registers)
+    projects.update(folders)
+
+    codes = tuple(sorted(projects))
+    _project_list_cache = (project_names, registers, folders, codes)
+    return list(codes)
+
 
-    return sorted(projects)
+# Risk statuses that count as active
+_OPEN_SET = frozenset(('Open', 'Active', 'Escalated'))
+
+# Task statuses that count as finished
+_DONE = frozenset(('Completed', 'Done'))
+
+
+def _as_date(value):
+    """Coerce a Due Date cell to a date. Returns None if it is empty or not a valid date."""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str) and value:
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+        try:
+            # Hand-typed dates without zero padding, e.g. 2025-3-7
+            return datetime.strptime(value, '%Y-%m-%d').date()
+        except ValueError:
+            return None
+    return None
 
 
 def get_project_stats(project_code):
     """Get stats for a single project."""
-    from datetime import datetime
     try:
-        data = read_excel_data(project_code)
+        data = read_excel_data(project_code, sheets=('risks', 'tasks'))
         risks = data.get('risks', [])
         tasks = data.get('tasks', [])
     except Exception:
         # Empty project with no data yet
         risks = []
         tasks = []
-    today = datetime.now().date()
-
-    active_risks = len([r for r in risks if r.get('Status') in ['Open', 'Active', 'Escalated']])
-    watching_risks = len([r for r in risks if r.get('Status') == 'Watching'])
-    closed_risks = len([r for r in risks if r.get('Status') == 'Closed'])
-    open_tasks = [t for t in tasks if t.get('Status') not in ['Completed', 'Done']]
-
+    return _compute_project_stats(risks, tasks, datetime.now().date())
+
+
+def _compute_project_stats(risks, tasks, today):
+    """Count risks and tasks by status and derive the project health."""
+
+    # Single pass over risks
+    active_risks = watching_risks = closed_risks = high_priority = 0
+    for r in risks:
+        status = r.get('Status')
+        if status in _OPEN_SET:
+            active_risks += 1
+        elif status == 'Watching':
+            watching_risks += 1
+        elif status == 'Closed':
+            closed_risks += 1
+        if r.get('Probability') == 'High' and status != 'Closed':
+            high_priority += 1
+
+    # Single pass over open tasks
+    open_tasks = 0
     overdue_count = 0
-    for t in open_tasks:
-        due_date = t.get('Due Date')
-        if due_date:
-            try:
-                if isinstance(due_date, str):
-                    due_date = datetime.strptime(due_date, '%Y-%m-%d').date()
-                elif hasattr(due_date, 'date'):
-                    due_date = due_date.date()
-                if due_date < today:
-                    overdue_count += 1
-            except:
-                pass
-
-    high_priority = len([r for r in risks if r.get('Probability') == 'High' and r.get('Status') != 'Closed'])
+    for t in tasks:
+        if t.get('Status') in _DONE:
+            continue
+        open_tasks += 1
+        due_date = _as_date(t.get('Due Date'))
+        if due_date is not None and due_date < today:
+            overdue_count += 1
 
     # Calculate health status
     if high_priority >= 3 or overdue_count >= 3:
@@ -876,7 +1416,7 @@ def get_project_stats(project_code):
         'watching_risks': watching_risks,
         'closed_risks': closed_risks,
         'total_risks': len(risks),
-        'open_tasks': len(open_tasks),
+        'open_tasks': open_tasks,
         'overdue_tasks': overdue_count,
         'total_tasks': len(tasks),
         'high_priority': high_priority,
@@ -887,27 +1427,109 @@ def get_project_stats(project_code):
 @app.route('/api/portfolio', methods=['GET'])
 def api_get_portfolio():
     """Get all projects with their stats for portfolio view."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    def _safe_stats(project_code):
+        try:
+            return project_code, get_project_stats(project_code)
+        except Exception as e:
+            print(f"Error loading project {project_code}: {e}")
+            return project_code, None
+
     try:
         projects = get_all_projects()
         portfolio = []
 
-        for project_code in projects:
-            try:
-                stats = get_project_stats(project_code)
-                portfolio.append({
-                    'code': project_code,
-                    'stats': stats
-                })
-            except Exception as e:
-                print(f"Error loading project {project_code}: {e}")
+        # Each project's register is read independently, so overlap the reads
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(projects)))) as executor:
+            for project_code, stats in executor.map(_safe_stats, projects):
+                if stats is not None:
+                    portfolio.append({
+                        'code': project_code,
+                        'stats': stats
+                    })
 
-        return jsonify({
+        return _json({
             "success": True,
             "projects": portfolio,
             "count": len(portfolio)
         })
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
+
+
+# Encoded JSON bodies keyed by (endpoint, project) -> (register versions, body bytes), LRU order
+_json_cache = OrderedDict()
+JSON_CACHE_SIZE = 64
+
+
+def _register_version(project_code):
+    """Get a project's Risk Register (mtime_ns, size), or None if it has no register."""
+    try:
+        return _file_version(get_risk_register_path(project_code))
+    except FileNotFoundError:
+        return None
+
+
+def _cached_json(cache_key, projects, build):
+    """
+    Return build() as a JSON response, reusing the encoded body until
+    the project list or any of the projects' Risk Registers change.
+    """
+    versions = tuple((proj, _register_version(proj)) for proj in projects)
+    with _excel_cache_lock:
+        cached = _json_cache.get(cache_key)
+        if cached is not None:
+            _json_cache.move_to_end(cache_key)
+
+    if cached is not None and cached[0] == versions:
+        body = cached[1]
+    else:
+        body = _dumps(build())
+        # Only cache known projects, so arbitrary ?project= values cannot grow the cache
+        known = get_all_projects()
+        if all(proj in known for proj in projects):
+            with _excel_cache_lock:
+                _json_cache[cache_key] = (versions, body)
+                _json_cache.move_to_end(cache_key)
+                if len(_json_cache) > JSON_CACHE_SIZE:
+                    _json_cache.popitem(last=False)
+
+    return app.response_class(body, mimetype='application/json')
+
+
+def _wants_ndjson():
+    """Check whether the client asked for newline-delimited JSON (?format=ndjson or Accept header)."""
+    return (request.args.get('format') == 'ndjson'
+            or request.accept_mimetypes.best == 'application/x-ndjson')
+
+
+def _ndjson_rows(projects, key):
+    """
+    Stream the rows of one sheet ('risks' or 'tasks') for several projects as NDJSON.
+    Registers are read in parallel and each project's rows are sent as soon as it
+    loads, so the client can start rendering before the slowest register is parsed.
+    A project that fails to load produces a single {"project", "error"} line.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    def generate():
+        if not projects:
+            return
+        with ThreadPoolExecutor(max_workers=min(8, len(projects))) as executor:
+            futures = {executor.submit(read_excel_data, proj, (key,)): proj for proj in projects}
+            for future in as_completed(futures):
+                proj = futures[future]
+                try:
+                    rows = future.result()[key]
+                except Exception as e:
+                    yield _dumps({"project": proj, "error": str(e)}) + b'\n'
+                    continue
+                for row in rows:
+                    row['project'] = proj
+                    yield _dumps(row) + b'\n'
+
+    return app.response_class(generate(), mimetype='application/x-ndjson')
 
 
 @app.route('/api/risks', methods=['GET'])
@@ -915,27 +1537,26 @@ def api_get_risks():
     """Get risks from the Risk Register. If no project specified, returns all."""
     project = request.args.get('project')
     try:
-        if project:
-            data = read_excel_data(project)
-            risks = data['risks']
-            for r in risks:
-                r['project'] = project
-        else:
-            # Get all risks from all projects
+        projects = [project] if project else get_all_projects()
+        if not project and _wants_ndjson():
+            return _ndjson_rows(projects, 'risks')
+
+        def build():
             risks = []
-            for proj in get_all_projects():
-                data = read_excel_data(proj)
+            for proj in projects:
+                data = read_excel_data(proj, sheets=('risks',))
                 for r in data['risks']:
                     r['project'] = proj
                     risks.append(r)
+            return {
+                "success": True,
+                "risks": risks,
+                "count": len(risks)
+            }
 
-        return jsonify({
-            "success": True,
-            "risks": risks,
-            "count": len(risks)
-        })
+        return _cached_json(('risks', project), projects, build)
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/tasks', methods=['GET'])
@@ -943,26 +1564,46 @@ def api_get_tasks():
     """Get tasks from the Risk Register. If no project specified, returns all."""
     project = request.args.get('project')
     try:
-        if project:
-            data = read_excel_data(project)
-            tasks = data['tasks']
-            for t in tasks:
-                t['project'] = project
-        else:
+        projects = [project] if project else get_all_projects()
+        if not project and _wants_ndjson():
+            return _ndjson_rows(projects, 'tasks')
+
+        def build():
             tasks = []
-            for proj in get_all_projects():
-                data = read_excel_data(proj)
+            for proj in projects:
+                data = read_excel_data(proj, sheets=('tasks',))
                 for t in data['tasks']:
                     t['project'] = proj
                     tasks.append(t)
+            return {
+                "success": True,
+                "tasks": tasks,
+                "count": len(tasks)
+            }
 
-        return jsonify({
-            "success": True,
-            "tasks": tasks,
-            "count": len(tasks)
-        })
+        return _cached_json(('tasks', project), projects, build)
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
+
+
+def _scan_task_slot(task_sheet, project):
+    """Scan the Tasks sheet for the next task number and the first empty row."""
+    prefix = f'{project}-T'
+    max_num = 0
+    next_row = None
+    for row_num, (task_id,) in enumerate(task_sheet.iter_rows(min_row=3, max_col=1, values_only=True), start=3):
+        if not task_id:
+            if next_row is None:
+                next_row = row_num
+            continue
+        if isinstance(task_id, str) and task_id.startswith(prefix):
+            try:
+                max_num = max(max_num, int(task_id.split('-T')[1]))
+            except ValueError:
+                pass
+    if next_row is None:
+        next_row = task_sheet.max_row + 1
+    return max_num + 1, next_row
 
 
 @app.route('/api/tasks', methods=['POST'])
@@ -977,37 +1618,27 @@ def api_create_task():
         add_to_outlook = data.get('add_to_outlook', False)
 
         if not task_text:
-            return jsonify({"success": False, "error": "Task description required"}), 400
+            return _json({"success": False, "error": "Task description required"}), 400
 
         # Load the workbook
         file_path = get_risk_register_path(project)
         if not file_path.exists():
-            return jsonify({"success": False, "error": f"Project {project} not found"}), 404
+            return _json({"success": False, "error": f"Project {project} not found"}), 404
 
         import openpyxl
+        version = _file_version(file_path)
         wb = openpyxl.load_workbook(file_path)
         task_sheet = wb['Tasks']
 
-        # Find the next task ID
-        existing_ids = []
-        for row in range(3, task_sheet.max_row + 1):
-            task_id = task_sheet.cell(row=row, column=1).value
-            if task_id and task_id.startswith(f'{project}-T'):
-                try:
-                    num = int(task_id.split('-T')[1])
-                    existing_ids.append(num)
-                except:
-                    pass
-
-        next_num = max(existing_ids) + 1 if existing_ids else 1
+        # Reuse the next ID/row from our last insert unless the file changed since
+        with _excel_cache_lock:
+            cached = _task_slot_cache.get(str(file_path))
+        if cached is not None and cached[0] == version:
+            next_num, next_row = cached[1], cached[2]
+        else:
+            next_num, next_row = _scan_task_slot(task_sheet, project)
         new_task_id = f"{project}-T{next_num:03d}"
-
-        # Find the next empty row
-        next_row = task_sheet.max_row + 1
-        for row in range(3, task_sheet.max_row + 1):
-            if not task_sheet.cell(row=row, column=1).value:
-                next_row = row
-                break
+        appended = next_row == task_sheet.max_row + 1
 
         # Add the task
         task_sheet.cell(row=next_row, column=1, value=new_task_id)
@@ -1019,6 +1650,14 @@ def api_create_task():
 
         wb.save(file_path)
         wb.close()
+        invalidate_excel_cache(file_path)
+
+        # After an append there are no gaps, so the next slot is simply the following row
+        with _excel_cache_lock:
+            if appended:
+                _task_slot_cache[str(file_path)] = (_file_version(file_path), next_num + 1, next_row + 1)
+            else:
+                _task_slot_cache.pop(str(file_path), None)
 
         new_task = {
             'Task ID': new_task_id,
@@ -1034,14 +1673,14 @@ def api_create_task():
         if add_to_outlook:
             outlook_result = create_outlook_task(task_text, due_date, project)
 
-        return jsonify({
+        return _json({
             "success": True,
             "task": new_task,
             "outlook": outlook_result
         })
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/calendar/event', methods=['POST'])
@@ -1058,31 +1697,73 @@ def api_create_calendar_event():
         attendee = data.get('attendee')
 
         if not title:
-            return jsonify({"success": False, "error": "Title required"}), 400
+            return _json({"success": False, "error": "Title required"}), 400
         if not date:
-            return jsonify({"success": False, "error": "Date required"}), 400
+            return _json({"success": False, "error": "Date required"}), 400
 
         # Try Microsoft Graph API first, fall back to ICS file
         result = create_outlook_calendar_event(title, date, time, duration, project, description, attendee)
-        return jsonify(result)
+        return _json(result)
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/calendar/download/<filename>', methods=['GET'])
 def api_download_ics(filename):
     """Download an ICS file."""
     from flask import send_file
-    ics_folder = Path(__file__).parent / 'ics_files'
-    file_path = ics_folder / filename
+    file_path = ICS_FOLDER / filename
 
     if not file_path.exists():
-        return jsonify({"success": False, "error": "File not found"}), 404
+        return _json({"success": False, "error": "File not found"}), 404
 
     return send_file(file_path, as_attachment=True, download_name=filename)
 
 
+# Keep-alive session and app-only access tokens for Microsoft Graph
+_graph_session = None
+_graph_tokens = {}  # (tenant_id, client_id, client_secret) -> (access_token, expires_at)
+_graph_lock = threading.Lock()
+
+
+def _get_graph_session():
+    """Get the shared requests session for Microsoft Graph calls."""
+    global _graph_session
+    import requests
+
+    with _graph_lock:
+        if _graph_session is None:
+            _graph_session = requests.Session()
+        return _graph_session
+
+
+def _get_graph_token(tenant_id, client_id, client_secret):
+    """Get a Graph access token, reusing the cached one until a minute before it expires."""
+    key = (tenant_id, client_id, client_secret)
+    with _graph_lock:
+        cached = _graph_tokens.get(key)
+    if cached and cached[1] > time.time():
+        return cached[0]
+
+    token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
+    token_data = {
+        'grant_type': 'client_credentials',
+        'client_id': client_id,
+        'client_secret': client_secret,
+        'scope': 'https://graph.microsoft.com/.default'
+    }
+    token_response = _get_graph_session().post(token_url, data=token_data, timeout=10)
+    token_response.raise_for_status()
+    token_json = token_response.json()
+
+    access_token = token_json['access_token']
+    expires_at = time.time() + int(token_json.get('expires_in', 3600)) - 60
+    with _graph_lock:
+        _graph_tokens[key] = (access_token, expires_at)
+    return access_token
+
+
 def create_outlook_calendar_event(title, date, time='09:00', duration=30, project='', description='', attendee=None):
     """Create a calendar event in Outlook via Microsoft Graph API."""
     import requests
@@ -1107,16 +1788,7 @@ def create_outlook_calendar_event(title, date, time='09:00', duration=30, projec
 
     try:
         # Get access token
-        token_url = f"https://login.microsoftonline.com/{tenant_id}/oauth2/v2.0/token"
-        token_data = {
-            'grant_type': 'client_credentials',
-            'client_id': client_id,
-            'client_secret': client_secret,
-            'scope': 'https://graph.microsoft.com/.default'
-        }
-        token_response = requests.post(token_url, data=token_data)
-        token_response.raise_for_status()
-        access_token = token_response.json()['access_token']
+        access_token = _get_graph_token(tenant_id, client_id, client_secret)
 
         # Create event via Graph API
         event_url = f"https://graph.microsoft.com/v1.0/users/{user_email}/calendar/events"
@@ -1154,7 +1826,7 @@ def create_outlook_calendar_event(title, date, time='09:00', duration=30, projec
             # Send invite to attendees
             event_body['isOnlineMeeting'] = False
 
-        response = requests.post(event_url, headers=headers, json=event_body)
+        response = _get_graph_session().post(event_url, headers=headers, json=event_body, timeout=10)
         response.raise_for_status()
 
         result = response.json()
@@ -1226,17 +1898,15 @@ def create_calendar_ics(title, date, time='09:00', duration=30, project='', desc
         "END:VCALENDAR"
     ])
 
-    ics_content = '\r\n'.join(ics_lines)
+    # ICS is UTF-8 with CRLF line endings; write bytes so text mode can't translate them
+    ics_bytes = '\r\n'.join(ics_lines).encode('utf-8')
 
     # Save to ics_files folder
-    ics_folder = Path(__file__).parent / 'ics_files'
-    ics_folder.mkdir(exist_ok=True)
+    ICS_FOLDER.mkdir(exist_ok=True)
 
     filename = f'event_{uid[:8]}.ics'
-    file_path = ics_folder / filename
-
-    with open(file_path, 'w') as f:
-        f.write(ics_content)
+    file_path = ICS_FOLDER / filename
+    file_path.write_bytes(ics_bytes)
 
     return {
         "success": True,
@@ -1282,13 +1952,13 @@ def api_check_emails():
                 ]
             })
 
-        return jsonify({
+        return _json({
             "success": True,
             "emails": summary,
             "count": len(summary)
         })
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/email/process', methods=['POST'])
@@ -1308,9 +1978,9 @@ def api_process_emails():
             subject_filter=subject_filter
         )
 
-        return jsonify(result)
+        return _json(result)
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/updates', methods=['GET'])
@@ -1319,16 +1989,16 @@ def api_get_updates():
     project = request.args.get('project', 'HB')
     limit = request.args.get('limit', 10, type=int)
     try:
-        data = read_excel_data(project)
+        data = read_excel_data(project, sheets=('updates',))
         # Sort by timestamp descending and limit
-        updates = sorted(data['updates'], key=lambda x: x.get('Timestamp', ''), reverse=True)[:limit]
-        return jsonify({
+        updates = heapq.nlargest(limit, data['updates'], key=lambda x: x.get('Timestamp', ''))
+        return _json({
             "success": True,
             "updates": updates,
             "count": len(updates)
         })
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/milestones', methods=['GET'])
@@ -1337,305 +2007,336 @@ def api_get_milestones():
     project = request.args.get('project')
     try:
         if project:
-            data = read_excel_data(project)
+            data = read_excel_data(project, sheets=('milestones',))
             milestones = data.get('milestones', [])
             for m in milestones:
                 m['project'] = project
         else:
-            # Get all milestones from all projects
+            # Get all milestones from all projects, loading the registers in parallel
+            projects = get_all_projects()
             milestones = []
-            for proj in get_all_projects():
-                data = read_excel_data(proj)
+            load = functools.partial(read_excel_data, sheets=('milestones',))
+            for proj, data in zip(projects, _map_projects(load, projects)):
                 for m in data.get('milestones', []):
                     m['project'] = proj
                     milestones.append(m)
 
-        # Calculate summary stats
-        critical_count = len([m for m in milestones if m.get('Status') == 'Critical'])
-        at_risk_count = len([m for m in milestones if m.get('Status') == 'At Risk'])
-        on_track_count = len([m for m in milestones if m.get('Status') == 'On Track'])
-        complete_count = len([m for m in milestones if m.get('Status') == 'Complete'])
+        # Calculate summary stats in one pass
+        status_counts = Counter(m.get('Status') for m in milestones)
 
-        return jsonify({
+        return _json({
             "success": True,
             "milestones": milestones,
             "count": len(milestones),
             "summary": {
-                "critical": critical_count,
-                "at_risk": at_risk_count,
-                "on_track": on_track_count,
-                "complete": complete_count
+                "critical": status_counts['Critical'],
+                "at_risk": status_counts['At Risk'],
+                "on_track": status_counts['On Track'],
+                "complete": status_counts['Complete']
             }
         })
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 def get_risk_register_path(project_code):
     """Get the path to a project's Risk Register file."""
-    return BASE_PATH / 'Risk_Registers' / f'Risk_Register_{project_code}.xlsx'
+    return RISK_REGISTERS_PATH / f'Risk_Register_{project_code}.xlsx'
+
+
+@dataclass(frozen=True)
+class ProjectSummary:
+    """
+    Report rows and stats for one project, computed in a single pass over its register.
+    Rows are tagged with 'project' and shared between callers, so treat them as read-only.
+    """
+    project: str
+    active_risks: tuple
+    high_risks: tuple
+    open_tasks: tuple
+    critical_milestones: tuple
+    stats: dict
+
+
+@functools.lru_cache(maxsize=64)
+def compute_project_summary(project, version, today):
+    """
+    Build the ProjectSummary for one version of a project's Risk Register.
+    version and today are only cache keys: a new register version or a new day
+    (which changes which tasks are overdue) produces a fresh summary.
+    """
+    # Only the sheets the report uses are copied out of the register cache
+    data = read_excel_data(project, sheets=('risks', 'tasks', 'milestones'))
+    risks = data['risks']
+    tasks = data['tasks']
+
+    active_risks = []
+    high_risks = []
+    for r in risks:
+        r['project'] = project
+        if r.get('Status') in _OPEN_SET:
+            active_risks.append(r)
+            if r.get('Probability') == 'High' and r.get('Impact') == 'High':
+                high_risks.append(r)
+
+    open_tasks = []
+    for t in tasks:
+        t['project'] = project
+        if t.get('Status') not in _DONE:
+            open_tasks.append(t)
+
+    critical_milestones = []
+    for m in data.get('milestones', []):
+        m['project'] = project
+        if m.get('Status') in ('Critical', 'At Risk'):
+            critical_milestones.append(m)
+
+    return ProjectSummary(
+        project=project,
+        active_risks=tuple(active_risks),
+        high_risks=tuple(high_risks),
+        open_tasks=tuple(open_tasks),
+        critical_milestones=tuple(critical_milestones),
+        stats=_compute_project_stats(risks, tasks, today),
+    )
+
+
+def _map_projects(func, projects):
+    """
+    Call func(project) for each project code and return the results in project order.
+    Registers are separate files and reading them releases the GIL while it waits on
+    I/O, so several projects are loaded at once on a small thread pool.
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    if len(projects) < 2:
+        return [func(proj) for proj in projects]
+    with ThreadPoolExecutor(max_workers=min(8, len(projects))) as executor:
+        return list(executor.map(func, projects))
+
+
+def get_report_summaries(project):
+    """Get the ProjectSummary for one project, or for every project when project is 'all'."""
+    projects = [project] if project and project != 'all' else get_all_projects()
+    today = datetime.now().date()
+    return _map_projects(lambda proj: compute_project_summary(proj, _register_version(proj), today), projects)
+
 
+def _risk_priority_key(risk):
+    """Sort key for report risk tables: High probability first, then by project."""
+    return (0 if risk.get('Probability') == 'High' else 1, risk.get('project', ''))
 
-def generate_report_html(project, report_type):
-    """Generate HTML content for a report."""
+
+def _task_due_key(task):
+    """Sort key for report task tables: earliest due date first, undated tasks first of all."""
+    return task.get('Due Date', '') or ''
+
+
+def _truncate(value, limit, suffix=''):
+    """Convert a cell value to text of at most limit characters (plus suffix when cut). None becomes ''."""
+    text = '' if value is None else str(value)
+    return text if len(text) <= limit else text[:limit] + suffix
+
+
+# Report titles by report type
+REPORT_TITLES = {
+    'current': 'Current Status Report',
+    'daily': 'Daily Digest',
+    'weekly': 'Weekly Summary',
+    'monthly': 'Monthly Executive Report'
+}
+
+
+@functools.lru_cache(maxsize=1)
+def _status_report_template():
+    """Get the compiled status report template. It is loaded once and never re-read from disk."""
+    from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+    env = Environment(
+        loader=FileSystemLoader(str(SCRIPT_DIR / 'templates')),
+        autoescape=select_autoescape(['html', 'j2']),
+        auto_reload=False,
+        cache_size=400,
+        trim_blocks=True,
+        lstrip_blocks=True,
+    )
+    return env.get_template('status_report.html.j2')
+
+
+def generate_report_html(project, report_type, summaries=None):
+    """
+    Generate HTML content for a report.
+    Pass summaries from get_report_summaries() to reuse data already loaded for another format.
+    """
     from datetime import datetime
 
-    # Get project data
-    if project and project != 'all':
-        data = read_excel_data(project)
-        projects_data = {project: data}
-    else:
-        # Portfolio-wide report
-        projects_data = {}
-        for proj in get_all_projects():
-            projects_data[proj] = read_excel_data(proj)
-
-    # Compile stats
-    all_risks = []
-    all_tasks = []
-    all_milestones = []
-
-    for proj, data in projects_data.items():
-        for r in data['risks']:
-            r['project'] = proj
-            all_risks.append(r)
-        for t in data['tasks']:
-            t['project'] = proj
-            all_tasks.append(t)
-        for m in data.get('milestones', []):
-            m['project'] = proj
-            all_milestones.append(m)
-
-    # Calculate stats
-    active_risks = [r for r in all_risks if r.get('Status') in ['Open', 'Active', 'Escalated']]
-    high_risks = [r for r in active_risks if r.get('Probability') == 'High' and r.get('Impact') == 'High']
-    open_tasks = [t for t in all_tasks if t.get('Status') not in ['Completed', 'Done']]
-    critical_milestones = [m for m in all_milestones if m.get('Status') in ['Critical', 'At Risk']]
-
-    # Build HTML
-    title_map = {
-        'current': 'Current Status Report',
-        'daily': 'Daily Digest',
-        'weekly': 'Weekly Summary',
-        'monthly': 'Monthly Executive Report'
-    }
+    if summaries is None:
+        summaries = get_report_summaries(project)
 
-    title = title_map.get(report_type, 'Status Report')
-    now = datetime.now()
-
-    html = f'''<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <title>{title}</title>
-    <style>
-        body {{ font-family: Arial, sans-serif; margin: 40px; color: #333; }}
-        h1 {{ color: #1e3a5f; border-bottom: 2px solid #1e3a5f; padding-bottom: 10px; }}
-        h2 {{ color: #2c5282; margin-top: 30px; }}
-        .header {{ background: #1e3a5f; color: white; padding: 20px; margin: -40px -40px 30px -40px; }}
-        .header h1 {{ color: white; border: none; margin: 0; }}
-        .header p {{ margin: 5px 0 0 0; opacity: 0.9; }}
-        .summary-box {{ background: #f7fafc; border: 1px solid #e2e8f0; padding: 15px; margin: 20px 0; border-radius: 8px; }}
-        .stat {{ display: inline-block; margin-right: 40px; }}
-        .stat-value {{ font-size: 28px; font-weight: bold; color: #1e3a5f; }}
-        .stat-label {{ font-size: 14px; color: #666; }}
-        .critical {{ color: #c53030; }}
-        .warning {{ color: #d69e2e; }}
-        table {{ width: 100%; border-collapse: collapse; margin: 15px 0; }}
-        th, td {{ padding: 10px; text-align: left; border-bottom: 1px solid #e2e8f0; }}
-        th {{ background: #edf2f7; font-weight: 600; }}
-        .status-critical {{ background: #fed7d7; color: #c53030; padding: 3px 8px; border-radius: 4px; }}
-        .status-at-risk {{ background: #feebc8; color: #c05621; padding: 3px 8px; border-radius: 4px; }}
-        .status-open {{ background: #bee3f8; color: #2b6cb0; padding: 3px 8px; border-radius: 4px; }}
-        .alert-banner {{ background: #fed7d7; border-left: 4px solid #c53030; padding: 15px; margin: 20px 0; }}
-    </style>
-</head>
-<body>
-    <div class="header">
-        <h1>{title}</h1>
-        <p>Generated: {now.strftime('%B %d, %Y at %I:%M %p')}</p>
-    </div>
-'''
-
-    # Critical alerts section
-    if high_risks or critical_milestones:
-        html += '<div class="alert-banner"><strong>CRITICAL ALERTS</strong><ul>'
-        for r in high_risks[:5]:
-            html += f'<li><strong>[{r.get("project")}]</strong> {r.get("Risk ID")}: {r.get("Description", "")[:100]}</li>'
-        for m in critical_milestones[:5]:
-            html += f'<li><strong>[{m.get("project")}]</strong> Milestone: {m.get("Milestone", "")} - {m.get("Status", "")}</li>'
-        html += '</ul></div>'
-
-    # Summary stats
-    html += f'''
-    <div class="summary-box">
-        <div class="stat">
-            <div class="stat-value">{len(active_risks)}</div>
-            <div class="stat-label">Active Risks</div>
-        </div>
-        <div class="stat">
-            <div class="stat-value critical">{len(high_risks)}</div>
-            <div class="stat-label">High/High Risks</div>
-        </div>
-        <div class="stat">
-            <div class="stat-value">{len(open_tasks)}</div>
-            <div class="stat-label">Open Tasks</div>
-        </div>
-        <div class="stat">
-            <div class="stat-value warning">{len(critical_milestones)}</div>
-            <div class="stat-label">Critical Milestones</div>
-        </div>
-    </div>
-'''
+    # Combine per-project rows, in project order
+    active_risks = [r for s in summaries for r in s.active_risks]
+    high_risks = [r for s in summaries for r in s.high_risks]
+    open_tasks = [t for s in summaries for t in s.open_tasks]
+    critical_milestones = [m for s in summaries for m in s.critical_milestones]
 
     # Project breakdown for portfolio reports
-    if len(projects_data) > 1 or report_type in ['daily', 'monthly']:
-        html += '<h2>Project Status</h2><table><tr><th>Project</th><th>Active Risks</th><th>High Priority</th><th>Open Tasks</th><th>Health</th></tr>'
-        for proj in sorted(projects_data.keys()):
-            stats = get_project_stats(proj)
-            health_class = 'status-critical' if stats['health'] == 'Critical' else 'status-at-risk' if stats['health'] == 'At Risk' else 'status-open'
-            html += f'<tr><td><strong>{proj}</strong></td><td>{stats["active_risks"]}</td><td>{stats["high_priority"]}</td><td>{stats["open_tasks"]}</td><td><span class="{health_class}">{stats["health"]}</span></td></tr>'
-        html += '</table>'
-
-    # Active risks table
-    html += '<h2>Active Risks</h2><table><tr><th>Project</th><th>Risk ID</th><th>Description</th><th>Prob/Impact</th><th>Status</th></tr>'
-    for r in sorted(active_risks, key=lambda x: (x.get('Probability') != 'High', x.get('project', '')))[:15]:
-        status_class = 'status-critical' if r.get('Probability') == 'High' else 'status-open'
-        html += f'<tr><td>{r.get("project", "")}</td><td>{r.get("Risk ID", "")}</td><td>{str(r.get("Description", ""))[:80]}</td><td>{r.get("Probability", "")}/{r.get("Impact", "")}</td><td><span class="{status_class}">{r.get("Status", "")}</span></td></tr>'
-    html += '</table>'
-
-    # Open tasks table
-    html += '<h2>Open Tasks</h2><table><tr><th>Project</th><th>Task ID</th><th>Task</th><th>Owner</th><th>Due Date</th></tr>'
-    for t in sorted(open_tasks, key=lambda x: x.get('Due Date', '') or '')[:15]:
-        html += f'<tr><td>{t.get("project", "")}</td><td>{t.get("Task ID", "")}</td><td>{str(t.get("Task", ""))[:80]}</td><td>{t.get("Owner", "")}</td><td>{t.get("Due Date", "")}</td></tr>'
-    html += '</table>'
-
-    # Critical milestones
-    if critical_milestones:
-        html += '<h2>Critical Milestones</h2><table><tr><th>Project</th><th>Milestone</th><th>Baseline</th><th>Current</th><th>Status</th></tr>'
-        for m in critical_milestones[:10]:
-            status_class = 'status-critical' if m.get('Status') == 'Critical' else 'status-at-risk'
-            html += f'<tr><td>{m.get("project", "")}</td><td>{m.get("Milestone", "")}</td><td>{m.get("Baseline Date", "")}</td><td>{m.get("Current Date", "")}</td><td><span class="{status_class}">{m.get("Status", "")}</span></td></tr>'
-        html += '</table>'
-
-    html += '</body></html>'
-    return html
-
-
-def generate_report_pdf(project, report_type):
-    """Generate a PDF report using ReportLab."""
-    from reportlab.lib import colors
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
+    project_rows = None
+    if len(summaries) > 1 or report_type in ['daily', 'monthly']:
+        project_rows = sorted(summaries, key=lambda s: s.project)
+
+    return _status_report_template().render(
+        title=REPORT_TITLES.get(report_type, 'Status Report'),
+        generated=datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+        alert_risks=high_risks[:5],
+        alert_milestones=critical_milestones[:5],
+        active_count=len(active_risks),
+        high_count=len(high_risks),
+        open_task_count=len(open_tasks),
+        critical_milestone_count=len(critical_milestones),
+        project_rows=project_rows,
+        # Partial sorts: only the rows shown are ordered and formatted
+        risk_rows=[
+            (r.get('project', ''), r.get('Risk ID', ''), _truncate(r.get('Description'), 80),
+             r.get('Probability', ''), r.get('Impact', ''), r.get('Status', ''),
+             'status-critical' if r.get('Probability') == 'High' else 'status-open')
+            for r in heapq.nsmallest(15, active_risks, key=_risk_priority_key)
+        ],
+        task_rows=[
+            (t.get('project', ''), t.get('Task ID', ''), _truncate(t.get('Task'), 80),
+             t.get('Owner', ''), t.get('Due Date', ''))
+            for t in heapq.nsmallest(15, open_tasks, key=_task_due_key)
+        ],
+        top_milestones=critical_milestones[:10],
+    )
+
+
+# Worker processes for ReportLab PDF builds (pure-Python CPU work that holds the GIL).
+# Kept small because every server process (each gunicorn worker) gets its own pool;
+# 0 builds in-process. Defaults to 2, or 0 on a single-CPU machine.
+PDF_WORKERS = int(os.getenv('PDF_WORKERS', min(2, (os.cpu_count() or 1) - 1)))
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _get_pdf_pool():
+    """
+    Get the process pool for PDF builds, created on first use, or None to build in-process.
+    The packaged app builds in-process: a frozen executable cannot re-launch itself as a worker.
+    """
+    global _pdf_pool
+    if getattr(sys, 'frozen', False) or PDF_WORKERS < 1:
+        return None
+    with _pdf_pool_lock:
+        if _pdf_pool is None:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            # Spawn rather than fork: forking a threaded server can copy held locks into the child
+            _pdf_pool = ProcessPoolExecutor(
+                max_workers=PDF_WORKERS,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        return _pdf_pool
+
+
+def _build_pdf(spec):
+    """Build a status report PDF on the worker pool, falling back to this process if the pool broke."""
+    global _pdf_pool
+    from concurrent.futures.process import BrokenProcessPool
+    from report_pdf import build_status_report_pdf
+
+    pool = _get_pdf_pool()
+    if pool is not None:
+        try:
+            return pool.submit(build_status_report_pdf, spec).result()
+        except BrokenProcessPool as e:
+            print(f"[Reports] PDF worker pool failed, building in-process: {e}")
+            with _pdf_pool_lock:
+                if _pdf_pool is pool:
+                    _pdf_pool = None
+    return build_status_report_pdf(spec)
+
+
+def generate_report_pdf(project, report_type, summaries=None):
+    """
+    Generate a PDF report using ReportLab.
+    Pass summaries from get_report_summaries() to reuse data already loaded for another format.
+    """
     from datetime import datetime
     import io
 
-    buffer = io.BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=letter, topMargin=0.5*inch, bottomMargin=0.5*inch)
+    if summaries is None:
+        summaries = get_report_summaries(project)
+
+    active_risks = [r for s in summaries for r in s.active_risks]
+    high_risks = [r for s in summaries for r in s.high_risks]
+    open_tasks = [t for s in summaries for t in s.open_tasks]
+
+    # Plain rows only, so the spec can be pickled to a worker process
+    spec = {
+        'title': REPORT_TITLES.get(report_type, 'Status Report'),
+        'generated': datetime.now().strftime('%B %d, %Y at %I:%M %p'),
+        'summary': [str(len(active_risks)), str(len(high_risks)), str(len(open_tasks)), str(len(summaries))],
+        'risk_rows': [
+            [r.get('project', ''), r.get('Risk ID', ''), _truncate(r.get('Description'), 50, '...'),
+             f"{r.get('Probability', '')}/{r.get('Impact', '')}"]
+            for r in heapq.nsmallest(10, active_risks, key=_risk_priority_key)
+        ],
+        'task_rows': [
+            [t.get('project', ''), t.get('Task ID', ''), _truncate(t.get('Task'), 50, '...'),
+             str(t.get('Due Date', '') or '')]
+            for t in heapq.nsmallest(10, open_tasks, key=_task_due_key)
+        ],
+    }
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=18, textColor=colors.HexColor('#1e3a5f'))
-    heading_style = ParagraphStyle('Heading', parent=styles['Heading2'], fontSize=14, textColor=colors.HexColor('#2c5282'))
+    return io.BytesIO(_build_pdf(spec))
 
-    elements = []
 
-    # Get data
-    if project and project != 'all':
-        data = read_excel_data(project)
-        projects_data = {project: data}
-    else:
-        projects_data = {}
-        for proj in get_all_projects():
-            projects_data[proj] = read_excel_data(proj)
-
-    # Compile stats
-    all_risks = []
-    all_tasks = []
-
-    for proj, data in projects_data.items():
-        for r in data['risks']:
-            r['project'] = proj
-            all_risks.append(r)
-        for t in data['tasks']:
-            t['project'] = proj
-            all_tasks.append(t)
-
-    active_risks = [r for r in all_risks if r.get('Status') in ['Open', 'Active', 'Escalated']]
-    high_risks = [r for r in active_risks if r.get('Probability') == 'High' and r.get('Impact') == 'High']
-    open_tasks = [t for t in all_tasks if t.get('Status') not in ['Completed', 'Done']]
-
-    # Title
-    title_map = {
-        'current': 'Current Status Report',
-        'daily': 'Daily Digest',
-        'weekly': 'Weekly Summary',
-        'monthly': 'Monthly Executive Report'
-    }
-    title = title_map.get(report_type, 'Status Report')
-    now = datetime.now()
+# Rendered reports keyed by (format, project, type, minute, register versions), oldest first
+_report_cache = OrderedDict()
+REPORT_CACHE_SIZE = 32
 
-    elements.append(Paragraph(title, title_style))
-    elements.append(Paragraph(f"Generated: {now.strftime('%B %d, %Y at %I:%M %p')}", styles['Normal']))
-    elements.append(Spacer(1, 0.3*inch))
 
-    # Summary
-    summary_data = [
-        ['Active Risks', 'High/High', 'Open Tasks', 'Projects'],
-        [str(len(active_risks)), str(len(high_risks)), str(len(open_tasks)), str(len(projects_data))]
-    ]
-    summary_table = Table(summary_data, colWidths=[1.5*inch]*4)
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1e3a5f')),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 1), (-1, 1), 16),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 10),
-        ('GRID', (0, 0), (-1, -1), 1, colors.HexColor('#e2e8f0')),
-    ]))
-    elements.append(summary_table)
-    elements.append(Spacer(1, 0.3*inch))
-
-    # Active risks
-    elements.append(Paragraph("Active Risks", heading_style))
-    if active_risks:
-        risk_data = [['Project', 'Risk ID', 'Description', 'Prob/Impact']]
-        for r in sorted(active_risks, key=lambda x: (x.get('Probability') != 'High', x.get('project', '')))[:10]:
-            desc = str(r.get('Description', ''))[:50] + ('...' if len(str(r.get('Description', ''))) > 50 else '')
-            risk_data.append([r.get('project', ''), r.get('Risk ID', ''), desc, f"{r.get('Probability', '')}/{r.get('Impact', '')}"])
-        risk_table = Table(risk_data, colWidths=[0.8*inch, 1*inch, 3.5*inch, 1*inch])
-        risk_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#edf2f7')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        elements.append(risk_table)
-    elements.append(Spacer(1, 0.2*inch))
-
-    # Open tasks
-    elements.append(Paragraph("Open Tasks", heading_style))
-    if open_tasks:
-        task_data = [['Project', 'Task ID', 'Task', 'Due Date']]
-        for t in sorted(open_tasks, key=lambda x: x.get('Due Date', '') or '')[:10]:
-            task_desc = str(t.get('Task', ''))[:50] + ('...' if len(str(t.get('Task', ''))) > 50 else '')
-            task_data.append([t.get('project', ''), t.get('Task ID', ''), task_desc, str(t.get('Due Date', '') or '')])
-        task_table = Table(task_data, colWidths=[0.8*inch, 1*inch, 3.5*inch, 1*inch])
-        task_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#edf2f7')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#e2e8f0')),
-            ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-        ]))
-        elements.append(task_table)
-
-    doc.build(elements)
-    buffer.seek(0)
-    return buffer
+def _cached_report(kind, project, report_type, build):
+    """
+    Return build() for a report, reusing the last result while the Risk Registers are unchanged.
+    Reports print their generation time to the minute, so the minute is part of the key.
+    """
+    projects = [project] if project and project != 'all' else get_all_projects()
+    key = (
+        kind,
+        project,
+        report_type,
+        datetime.now().strftime('%Y-%m-%d %H:%M'),
+        tuple((proj, _register_version(proj)) for proj in projects),
+    )
+    with _excel_cache_lock:
+        result = _report_cache.get(key)
+        if result is not None:
+            _report_cache.move_to_end(key)
+    if result is None:
+        result = build()
+        with _excel_cache_lock:
+            _report_cache[key] = result
+            if len(_report_cache) > REPORT_CACHE_SIZE:
+                _report_cache.popitem(last=False)
+    return result
+
+
+def build_report(project, report_type):
+    """
+    Build the HTML and PDF versions of a report from one load of the project data.
+    Returns (html, pdf_bytes); either may come from the report cache.
+    """
+    summaries = get_report_summaries(project)
+    html = _cached_report(
+        'html', project, report_type,
+        lambda: generate_report_html(project, report_type, summaries=summaries)
+    )
+    pdf_bytes = _cached_report(
+        'pdf', project, report_type,
+        lambda: generate_report_pdf(project, report_type, summaries=summaries).getvalue()
+    )
+    return html, pdf_bytes
 
 
 @app.route('/api/reports/pdf', methods=['GET'])
@@ -1643,12 +2344,17 @@ def api_download_report_pdf():
     """Generate and download a PDF report."""
     from flask import send_file
     from datetime import datetime
+    import io
 
     project = request.args.get('project', 'all')
     report_type = request.args.get('type', 'current')
 
     try:
-        pdf_buffer = generate_report_pdf(project, report_type)
+        pdf_bytes = _cached_report(
+            'pdf', project, report_type,
+            lambda: generate_report_pdf(project, report_type).getvalue()
+        )
+        pdf_buffer = io.BytesIO(pdf_bytes)
 
         filename = f"report_{project}_{report_type}_{datetime.now().strftime('%Y%m%d_%H%M')}.pdf"
 
@@ -1659,7 +2365,7 @@ def api_download_report_pdf():
             download_name=filename
         )
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/reports/preview', methods=['GET'])
@@ -1669,21 +2375,21 @@ def api_preview_report():
     report_type = request.args.get('type', 'current')
 
     try:
-        html = generate_report_html(project, report_type)
+        html = _cached_report('html', project, report_type, lambda: generate_report_html(project, report_type))
         return html, 200, {'Content-Type': 'text/html'}
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/reports/send', methods=['POST'])
 def api_send_report():
     """Send a report via email."""
-    import smtplib
     from email.mime.multipart import MIMEMultipart
     from email.mime.text import MIMEText
     from email.mime.base import MIMEBase
     from email import encoders
     from datetime import datetime
+    import base64
 
     try:
         data = request.get_json()
@@ -1693,7 +2399,7 @@ def api_send_report():
         include_attachments = data.get('include_attachments', False)
 
         if not recipient_email:
-            return jsonify({"success": False, "error": "Email address required"}), 400
+            return _json({"success": False, "error": "Email address required"}), 400
 
         # Email config
         smtp_server = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
@@ -1702,20 +2408,15 @@ def api_send_report():
         email_password = os.getenv('EMAIL_PASSWORD')
 
         if not sender_email or not email_password:
-            return jsonify({"success": False, "error": "Email credentials not configured"}), 500
+            return _json({"success": False, "error": "Email credentials not configured"}), 500
 
         # Build subject and HTML
-        title_map = {
-            'current': 'Current Status Report',
-            'daily': 'Daily Digest',
-            'weekly': 'Weekly Summary',
-            'monthly': 'Monthly Executive Report'
-        }
-        subject = f"[Risk Management] {title_map.get(report_type, 'Report')}"
+        subject = f"[Risk Management] {REPORT_TITLES.get(report_type, 'Report')}"
         if project and project != 'all':
             subject += f" - {project}"
 
-        html_content = generate_report_html(project, report_type)
+        # One data load for both the HTML body and the PDF attachment
+        html_content, pdf_bytes = build_report(project, report_type)
 
         # Create message
         msg = MIMEMultipart()
@@ -1726,9 +2427,8 @@ def api_send_report():
         msg.attach(MIMEText(html_content, 'html'))
 
         # Attach PDF
-        pdf_buffer = generate_report_pdf(project, report_type)
         pdf_attachment = MIMEBase('application', 'pdf')
-        pdf_attachment.set_payload(pdf_buffer.read())
+        pdf_attachment.set_payload(pdf_bytes)
         encoders.encode_base64(pdf_attachment)
         pdf_filename = f"report_{project}_{report_type}_{datetime.now().strftime('%Y%m%d')}.pdf"
         pdf_attachment.add_header('Content-Disposition', 'attachment', filename=pdf_filename)
@@ -1741,23 +2441,27 @@ def api_send_report():
             else:
                 projects_to_attach = get_all_projects()
 
+            # Base64 payloads keyed by content hash, so identical register files are encoded once
+            encoded_by_hash = {}
             for proj in projects_to_attach:
-                file_path = get_risk_register_path(proj)
-                if file_path.exists():
-                    with open(file_path, 'rb') as f:
-                        attachment = MIMEBase('application', 'vnd.openxmlformats-officedocument.spreadsheetml.sheet')
-                        attachment.set_payload(f.read())
-                        encoders.encode_base64(attachment)
-                        attachment.add_header('Content-Disposition', 'attachment', filename=f'Risk_Register_{proj}.xlsx')
-                        msg.attach(attachment)
-
-        # Send email
-        with smtplib.SMTP(smtp_server, smtp_port) as server:
-            server.starttls()
-            server.login(sender_email, email_password)
-            server.send_message(msg)
-
-        return jsonify({
+                try:
+                    content = get_risk_register_path(proj).read_bytes()
+                except FileNotFoundError:
+                    continue
+                content_hash = hashlib.blake2b(content, digest_size=16).digest()
+                encoded = encoded_by_hash.get(content_hash)
+                if encoded is None:
+                    encoded = encoded_by_hash[content_hash] = base64.encodebytes(content).decode('ascii')
+                attachment = MIMEBase('application', 'vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+                attachment.set_payload(encoded)
+                attachment['Content-Transfer-Encoding'] = 'base64'
+                attachment.add_header('Content-Disposition', 'attachment', filename=f'Risk_Register_{proj}.xlsx')
+                msg.attach(attachment)
+
+        # Send email over the shared connection, reused across report and digest sends
+        send_smtp_message(msg, sender_email, email_password, server=smtp_server, port=smtp_port)
+
+        return _json({
             "success": True,
             "message": f"Report sent to {recipient_email}",
             "report_type": report_type,
@@ -1766,7 +2470,59 @@ def api_send_report():
         })
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
+
+
+# Task statuses counted as open on the dashboard
+_OPEN_TASK_SET = frozenset(('Open', 'In Progress', None, ''))
+
+
+@functools.lru_cache(maxsize=64)
+def _dashboard_stats(project, version, today):
+    """
+    Count dashboard stats for one version of a project's Risk Register in a single pass.
+    version and today are only cache keys, so due dates are parsed once per register
+    version per day instead of on every /api/stats call.
+    """
+    data = read_excel_data(project, sheets=('risks', 'tasks'))
+    risks = data['risks']
+    tasks = data['tasks']
+
+    active_risks = watching_risks = closed_risks = items_not_green = high_priority = 0
+    for r in risks:
+        status = r.get('Status')
+        if status in _OPEN_SET:
+            active_risks += 1
+        elif status == 'Watching':
+            watching_risks += 1
+        elif status == 'Closed':
+            closed_risks += 1
+        # Items not green (non-closed risks)
+        if status not in ('Closed', None, ''):
+            items_not_green += 1
+        if r.get('Probability') == 'High' and status != 'Closed':
+            high_priority += 1
+
+    open_tasks = overdue_count = 0
+    for t in tasks:
+        if t.get('Status') not in _OPEN_TASK_SET:
+            continue
+        open_tasks += 1
+        due_date = _as_date(t.get('Due Date'))
+        if due_date is not None and due_date < today:
+            overdue_count += 1
+
+    return {
+        "active_risks": active_risks,
+        "watching_risks": watching_risks,
+        "closed_risks": closed_risks,
+        "total_risks": len(risks),
+        "open_tasks": open_tasks,
+        "overdue_tasks": overdue_count,
+        "total_tasks": len(tasks),
+        "items_not_green": items_not_green,
+        "high_priority": high_priority
+    }
 
 
 @app.route('/api/stats', methods=['GET'])
@@ -1774,59 +2530,15 @@ def api_get_stats():
     """Get dashboard statistics."""
     project = request.args.get('project', 'HB')
     try:
-        from datetime import datetime, timedelta
-        data = read_excel_data(project)
-        risks = data['risks']
-        tasks = data['tasks']
-
-        today = datetime.now().date()
-
-        # Count risks by status
-        active_risks = len([r for r in risks if r.get('Status') in ['Open', 'Active', 'Escalated']])
-        watching_risks = len([r for r in risks if r.get('Status') == 'Watching'])
-        closed_risks = len([r for r in risks if r.get('Status') == 'Closed'])
-
-        # Count tasks
-        open_tasks = [t for t in tasks if t.get('Status') in ['Open', 'In Progress', None, '']]
-
-        # Overdue tasks
-        overdue_count = 0
-        for t in open_tasks:
-            due_date = t.get('Due Date')
-            if due_date:
-                try:
-                    if isinstance(due_date, str):
-                        due_date = datetime.strptime(due_date, '%Y-%m-%d').date()
-                    elif hasattr(due_date, 'date'):
-                        due_date = due_date.date()
-                    if due_date < today:
-                        overdue_count += 1
-                except:
-                    pass
-
-        # Items not green (non-closed risks)
-        items_not_green = [r for r in risks if r.get('Status') not in ['Closed', None, '']]
-
-        # High priority items
-        high_priority = [r for r in risks if r.get('Probability') == 'High' and r.get('Status') != 'Closed']
-
-        return jsonify({
+        now = datetime.now()
+        stats = _dashboard_stats(project, _register_version(project), now.date())
+        return _json({
             "success": True,
-            "stats": {
-                "active_risks": active_risks,
-                "watching_risks": watching_risks,
-                "closed_risks": closed_risks,
-                "total_risks": len(risks),
-                "open_tasks": len(open_tasks),
-                "overdue_tasks": overdue_count,
-                "total_tasks": len(tasks),
-                "items_not_green": len(items_not_green),
-                "high_priority": len(high_priority)
-            },
-            "last_updated": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            "stats": stats,
+            "last_updated": now.strftime('%Y-%m-%d %H:%M:%S')
         })
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 # ============== Monthly Report Endpoints ==============
@@ -1862,7 +2574,7 @@ def api_generate_monthly_report(project):
         # Check project exists
         project_path = get_risk_register_path(project)
         if not project_path.exists():
-            return jsonify({"success": False, "error": f"Project {project} not found"}), 404
+            return _json({"success": False, "error": f"Project {project} not found"}), 404
 
         if preview_only:
             # Return HTML preview
@@ -1872,11 +2584,11 @@ def api_generate_monthly_report(project):
         if email:
             # Send email with report
             result = send_monthly_report(project, email, include_attachments=include_attachments)
-            return jsonify(result), 200 if result['success'] else 500
+            return _json(result), 200 if result['success'] else 500
         else:
             # Generate preview without sending
             html = preview_monthly_report(project)
-            return jsonify({
+            return _json({
                 "success": True,
                 "message": "Report generated (preview mode - no email sent)",
                 "project": project,
@@ -1885,7 +2597,7 @@ def api_generate_monthly_report(project):
             })
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/monthly-report/<project>/preview', methods=['GET'])
@@ -1896,29 +2608,28 @@ def api_preview_monthly_report(project):
     try:
         project_path = get_risk_register_path(project)
         if not project_path.exists():
-            return jsonify({"success": False, "error": f"Project {project} not found"}), 404
+            return _json({"success": False, "error": f"Project {project} not found"}), 404
 
         html = preview_monthly_report(project)
         return html, 200, {'Content-Type': 'text/html'}
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/monthly-report/<project>/download/docx', methods=['GET'])
 def api_download_monthly_docx(project):
     """Download monthly report as Word document."""
     from flask import send_file
-    from monthly_report import generate_word_document, read_project_data, calculate_project_health
+    from monthly_report import generate_word_document, get_project_report
     from datetime import datetime
 
     try:
         project_path = get_risk_register_path(project)
         if not project_path.exists():
-            return jsonify({"success": False, "error": f"Project {project} not found"}), 404
+            return _json({"success": False, "error": f"Project {project} not found"}), 404
 
-        data = read_project_data(project)
-        health = calculate_project_health(data)
+        data, health = get_project_report(project)
         report_date = datetime.now()
 
         doc_buffer = generate_word_document(project, data, health, report_date)
@@ -1932,22 +2643,22 @@ def api_download_monthly_docx(project):
         )
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 @app.route('/api/monthly-report/<project>/download/tasks', methods=['GET'])
 def api_download_task_export(project):
     """Download task list as Excel."""
     from flask import send_file
-    from monthly_report import generate_task_export, read_project_data
+    from monthly_report import generate_task_export, get_project_report
     from datetime import datetime
 
     try:
         project_path = get_risk_register_path(project)
         if not project_path.exists():
-            return jsonify({"success": False, "error": f"Project {project} not found"}), 404
+            return _json({"success": False, "error": f"Project {project} not found"}), 404
 
-        data = read_project_data(project)
+        data, _ = get_project_report(project)
         excel_buffer = generate_task_export(project, data)
 
         filename = f"Task_List_{project}_{datetime.now().strftime('%Y%m')}.xlsx"
@@ -1959,51 +2670,87 @@ def api_download_task_export(project):
         )
 
     except Exception as e:
-        return jsonify({"success": False, "error": str(e)}), 500
+        return _json({"success": False, "error": str(e)}), 500
 
 
 def scheduled_daily_digest():
     """Scheduled job to send daily digest at 6:00 AM."""
     print("[Scheduler] Running daily digest job...", flush=True)
+    recipients = os.getenv('EMAIL_TO', '')
+
     try:
-        recipients = os.getenv('EMAIL_TO', '')
         projects = get_all_projects()
-        for project in projects:
-            send_digest_email(project, recipients=recipients)
     except Exception as e:
         print(f"[Scheduler] Error sending daily digest: {e}", flush=True)
+        return
 
+    # One project at a time: each digest renders a ReportLab PDF, which is CPU-bound and
+    # not thread-safe, and the sends share daily_digest's SMTP connection anyway
+    for project in projects:
+        # One project's failure must not stop the other digests
+        try:
+            send_digest_email(project, recipients=recipients)
+        except Exception as e:
+            print(f"[Scheduler] Error sending daily digest for {project}: {e}", flush=True)
 
-if __name__ == '__main__':
-    port = int(os.environ.get('PORT', 5000))
-    debug = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
 
-    print(f"Starting Risk Management Server on port {port}")
-    print(f"Debug mode: {debug}")
-    print("\nEndpoints:")
-    print(f"  GET  /health         - Health check")
-    print(f"  GET  /projects       - List available projects")
-    print(f"  POST /process        - Process content and extract risks/tasks")
-    print(f"  POST /digest         - Send digest email now")
-    print(f"  GET  /digest/preview - Preview digest in browser")
-    print("\nExample request:")
-    print('''  curl -X POST http://localhost:5000/process \\
-    -H "Content-Type: application/json" \\
-    -d '{"project": "YOUR_PROJECT", "content": "...", "source_type": "meeting", "source_name": "Weekly Standup"}'
-''')
+# Held for the life of the process that owns the watchers and scheduler
+SERVICES_LOCK_PATH = BASE_PATH / '.background_services.lock'
+_services_lock_fd = None
+
+
+def _acquire_services_lock():
+    """
+    Take the cross-process lock for the background services without blocking.
+    Returns False if another process (e.g. another server worker) already holds it.
+    """
+    global _services_lock_fd
+    if _services_lock_fd is not None:
+        return True
+    try:
+        import fcntl
+    except ImportError:
+        # No flock on Windows; the desktop app runs a single server process
+        return True
+
+    fd = os.open(SERVICES_LOCK_PATH, os.O_CREAT | os.O_RDWR, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        os.close(fd)
+        return False
+    _services_lock_fd = fd
+    return True
+
 
-    # Start folder watchers for all projects
-    observers = []
+def start_background_services(scheduler=None):
+    """
+    Start the transcript folder watchers and the daily digest scheduler.
+    Only one process per data folder runs them: the first to take the services lock.
+    Other processes skip them and just serve HTTP.
+
+    Args:
+        scheduler: Unstarted APScheduler scheduler for the digest job. Defaults to a
+            BackgroundScheduler; pass an AsyncIOScheduler when running on an event loop.
+
+    Returns (observer, scheduler), or None if another process already runs the services.
+    """
+    if not _acquire_services_lock():
+        print("[Background Services] Already running in another process; serving HTTP only", flush=True)
+        return None
+
+    # One observer thread watches every project's Transcripts folder
+    observer = create_observer()
     for project in get_all_projects():
         transcripts_path = BASE_PATH / project / "Transcripts"
-        # Create the directory if it doesn't exist
-        transcripts_path.mkdir(parents=True, exist_ok=True)
-        observer = start_folder_watcher(transcripts_path, project)
-        observers.append(observer)
+        # start_folder_watcher creates the directory if it doesn't exist
+        start_folder_watcher(transcripts_path, project, observer=observer)
         print(f"[Folder Watcher] Watching: {transcripts_path}")
+    observer.start()
 
     # Start scheduler for daily digest at 6:00 AM
-    scheduler = BackgroundScheduler()
+    if scheduler is None:
+        scheduler = BackgroundScheduler()
     scheduler.add_job(
         func=scheduled_daily_digest,
         trigger='cron',
@@ -2011,21 +2758,104 @@ if __name__ == '__main__':
         minute=0,
         id='daily_digest',
         name='Send daily risk digest email',
-        replace_existing=True
+        replace_existing=True,
+        # At most one digest run at a time; a late or missed 6:00 run fires once, up to an hour late
+        coalesce=True,
+        max_instances=1,
+        misfire_grace_time=3600
     )
     scheduler.start()
     print("[Scheduler] Daily digest scheduled for 6:00 AM")
 
     # Ensure scheduler shuts down on exit
-    atexit.register(lambda: scheduler.shutdown())
+    atexit.register(_shutdown_scheduler, scheduler)
 
-    try:
-        # use_reloader=False is required for PyInstaller bundles
-        # threaded=True allows handling concurrent requests
-        app.run(host='0.0.0.0', port=port, debug=debug, use_reloader=False, threaded=True)
-    finally:
-        # Stop all folder watchers
-        for obs in observers:
-            obs.stop()
-            obs.join()
+    return observer, scheduler
+
+
+def _shutdown_scheduler(scheduler):
+    """Shut the scheduler down unless that already happened (both atexit and the main block call this)."""
+    if scheduler.running:
         scheduler.shutdown()
+
+
+def stop_background_services(observer, scheduler):
+    """Stop the folder watcher and the scheduler started by start_background_services."""
+    observer.stop()
+    # Bounded so a watcher stuck in a transcript run cannot hold up process exit
+    observer.join(timeout=2.0)
+    _shutdown_scheduler(scheduler)
+
+
+def run_gunicorn():
+    """
+    Serve the app with gunicorn using the settings in gunicorn.conf.py.
+    Returns False without serving if gunicorn is not available (e.g. on Windows).
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        return False
+    import runpy
+
+    config_path = Path(__file__).parent / 'gunicorn.conf.py'
+
+    # The config's worker hooks import server; make that this running module
+    # rather than a second copy of server.py
+    sys.modules.setdefault('server', sys.modules[__name__])
+
+    class RiskServerApplication(BaseApplication):
+        def load_config(self):
+            settings = runpy.run_path(str(config_path)) if config_path.exists() else {}
+            for key, value in settings.items():
+                if key in self.cfg.settings and value is not None:
+                    self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    RiskServerApplication().run()
+    return True
+
+
+if __name__ == '__main__':
+    port = int(os.environ.get('PORT', 5000))
+    debug = os.environ.get('FLASK_DEBUG', 'false').lower() == 'true'
+
+    print(f"Starting Risk Management Server on port {port}")
+    print(f"Debug mode: {debug}")
+    print("\nEndpoints:")
+    print(f"  GET  /health         - Health check")
+    print(f"  GET  /projects       - List available projects")
+    print(f"  POST /process        - Process content and extract risks/tasks")
+    print(f"  POST /digest         - Send digest email now")
+    print(f"  GET  /digest/preview - Preview digest in browser")
+    print("\nExample request:")
+    print('''  curl -X POST http://localhost:5000/process \\
+    -H "Content-Type: application/json" \\
+    -d '{"project": "YOUR_PROJECT", "content": "...", "source_type": "meeting", "source_name": "Weekly Standup"}'
+''')
+
+    # Flask's threaded server by default. SERVER=gunicorn (or --gunicorn) serves through gunicorn
+    # with gunicorn.conf.py instead, which forks several workers, each with its own caches and PDF
+    # pool, so it is opt-in and ignored in the desktop bundle and with FLASK_DEBUG=true.
+    # Under gunicorn the background services start in one worker (gunicorn.conf.py hooks), never
+    # in the master: workers forked from a master running threads can inherit held locks.
+    use_gunicorn = ((os.getenv('SERVER', '').strip().lower() == 'gunicorn' or '--gunicorn' in sys.argv[1:])
+                    and not debug and not getattr(sys, 'frozen', False))
+
+    if use_gunicorn and not run_gunicorn():
+        print("[Server] gunicorn is not installed; using Flask's threaded server")
+        use_gunicorn = False
+
+    if not use_gunicorn:
+        run_services = os.getenv('BACKGROUND_SERVICES', 'true').strip().lower() not in ('0', 'false', 'no')
+        services = start_background_services() if run_services else None
+
+        try:
+            # use_reloader=False is required for PyInstaller bundles
+            # threaded=True allows handling concurrent requests
+            app.run(host='0.0.0.0', port=port, debug=debug, use_reloader=False, threaded=True)
+        finally:
+            if services is not None:
+                stop_background_services(*services)
@@ -0,0 +1,66 @@
+import asyncio
+import importlib
+import time
+
+import pytest
+
+pytest.importorskip('asgiref')
+pytest.importorskip('apscheduler')
+
+from flask import Flask
+
+
+@pytest.fixture
+def asgi(tmp_path, monkeypatch):
+    # Importing asgi imports server, which creates its data folders under USER_DATA_PATH
+    monkeypatch.setenv('USER_DATA_PATH', str(tmp_path))
+    return importlib.import_module('asgi')
+
+
+def _sleepy_app():
+    app = Flask(__name__)
+
+    @app.route('/slow')
+    def slow():
+        time.sleep(0.5)
+        return 'done'
+
+    return app
+
+
+async def _get(app, path):
+    scope = {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': 'GET',
+        'path': path,
+        'query_string': b'',
+        'headers': [],
+    }
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+def test_concurrent_requests_overlap(asgi):
+    app = asgi.PooledWsgiToAsgi(_sleepy_app())
+
+    async def run():
+        return await asyncio.gather(*(_get(app, '/slow') for _ in range(4)))
+
+    start = time.monotonic()
+    responses = asyncio.run(run())
+    elapsed = time.monotonic() - start
+
+    for messages in responses:
+        assert messages[0]['status'] == 200
+        assert b''.join(m.get('body', b'') for m in messages[1:]) == b'done'
+    # Four 0.5s requests run one after another would take 2s
+    assert elapsed < 1.5
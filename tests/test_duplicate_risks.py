@@ -0,0 +1,61 @@
+"""Tests for matching extracted risks against titles already in the Risk Register."""
+
+import openpyxl
+import pytest
+
+import process
+from process import find_duplicate_risk, get_existing_titles, update_risk_register
+
+
+def make_workbook(titles):
+    """Build a workbook with a Risk Register sheet holding one row per title."""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = "Risk Register"
+    ws.append(["Risk ID", "Title"])
+    for i, title in enumerate(titles, start=1):
+        ws.append([f"R-2026-{i:03d}", title])
+    return wb
+
+
+def test_exact_title_matches_existing_row():
+    titles = get_existing_titles(make_workbook(["Budget overrun", "Crane availability"])["Risk Register"])
+    assert find_duplicate_risk("  budget OVERRUN ", titles) == 2
+    assert find_duplicate_risk("Crane availability", titles) == 3
+
+
+def test_unrelated_or_empty_title_is_new():
+    titles = get_existing_titles(make_workbook(["Budget overrun"])["Risk Register"])
+    assert find_duplicate_risk("Permit delay", titles) is None
+    assert find_duplicate_risk("", titles) is None
+    assert find_duplicate_risk(None, titles) is None
+
+
+def test_reordered_title_matches_when_rapidfuzz_installed():
+    pytest.importorskip("rapidfuzz")
+    titles = get_existing_titles(make_workbook(["Steel delivery delay"])["Risk Register"])
+    assert find_duplicate_risk("Delay steel delivery", titles) == 2
+
+
+def test_shorter_title_is_not_merged_into_longer_one():
+    pytest.importorskip("rapidfuzz")
+    titles = get_existing_titles(make_workbook(["Budget overrun on phase 2 steel"])["Risk Register"])
+    assert find_duplicate_risk("Budget overrun", titles) is None
+
+
+def test_update_risk_register_notes_duplicates_and_appends_new_risks(monkeypatch):
+    monkeypatch.setattr(process, "fuzz", None)
+    wb = make_workbook(["Budget overrun"])
+    changes = update_risk_register(
+        wb,
+        [{"title": "Budget overrun"}, {"title": "Permit delay"}, {"title": None}],
+        "Weekly Standup",
+    )
+    ws = wb["Risk Register"]
+
+    assert changes[0] == "Updated Risk R-2026-001: Budget overrun (already in register)"
+    assert "Raised again in Weekly Standup" in ws.cell(row=2, column=15).value
+    assert changes[1].startswith("Added Risk") and changes[1].endswith("Permit delay")
+    assert ws.cell(row=3, column=2).value == "Permit delay"
+    # A null title is written as an empty cell instead of failing the update
+    assert ws.max_row == 4 and not ws.cell(row=4, column=2).value
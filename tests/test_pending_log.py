@@ -0,0 +1,60 @@
+import openpyxl
+import pytest
+
+from process import (
+    clear_pending_log,
+    flush_pending_log,
+    get_pending_log_path,
+    queue_log_entry,
+    restore_pending_log,
+)
+
+
+@pytest.fixture
+def register(tmp_path):
+    return tmp_path / "Risk_Register_HB.xlsx"
+
+
+@pytest.fixture
+def workbook():
+    wb = openpyxl.Workbook()
+    wb.active.title = "Update Log"
+    return wb
+
+
+def _logged_sources(workbook):
+    ws = workbook["Update Log"]
+    return [ws.cell(row=row, column=2).value for row in range(2, ws.max_row + 1)]
+
+
+def test_entry_queued_during_flush_is_kept(register, workbook):
+    queue_log_entry(register, "Standup 1", "Meeting Transcript", {"risks": []})
+
+    count, claimed = flush_pending_log(workbook, register)
+    # Another run queues an entry while the workbook is being updated
+    queue_log_entry(register, "Standup 2", "Meeting Transcript", {"risks": []})
+    clear_pending_log(claimed)
+
+    assert count == 1
+    assert _logged_sources(workbook) == ["Standup 1"]
+    assert not claimed.exists()
+    assert "Standup 2" in get_pending_log_path(register).read_text(encoding="utf-8")
+
+
+def test_failed_save_restores_entries(register, workbook):
+    queue_log_entry(register, "Standup 1", "Meeting Transcript", {"risks": []})
+
+    _, claimed = flush_pending_log(workbook, register)
+    queue_log_entry(register, "Standup 2", "Meeting Transcript", {"risks": []})
+    restore_pending_log(register, claimed)
+
+    retry = openpyxl.Workbook()
+    retry.active.title = "Update Log"
+    count, claimed = flush_pending_log(retry, register)
+    assert count == 2
+    assert sorted(_logged_sources(retry)) == ["Standup 1", "Standup 2"]
+
+
+def test_flush_without_queue(register, workbook):
+    assert flush_pending_log(workbook, register) == (0, None)
+    clear_pending_log(None)
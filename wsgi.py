@@ -0,0 +1,29 @@
+"""
+WSGI entry point for running the Risk Management server under a production server.
+
+Linux/macOS (gunicorn, settings in gunicorn.conf.py):
+    gunicorn -c gunicorn.conf.py wsgi:app
+
+Windows (waitress):
+    waitress-serve --listen=0.0.0.0:5000 --threads=8 wsgi:app
+
+Under gunicorn the folder watchers and digest scheduler are started by the
+post_worker_init hook in gunicorn.conf.py, in the one worker that takes the
+services lock, so always pass -c gunicorn.conf.py. They are not started here:
+this module is imported in the gunicorn master (preload_app), and threads running
+in the master would be forked into every worker. Under other servers they start
+on import; the first process to take the services lock (see
+start_background_services) runs them and the rest serve the API only. Set
+BACKGROUND_SERVICES=false to skip them entirely.
+"""
+
+import os
+import sys
+
+from server import app, start_background_services
+
+__all__ = ['app']
+
+if ('gunicorn' not in sys.modules
+        and os.getenv('BACKGROUND_SERVICES', 'true').strip().lower() not in ('0', 'false', 'no')):
+    start_background_services()
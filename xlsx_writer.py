@@ -0,0 +1,117 @@
+"""
+Fast XLSX generation for reports built from Risk Register data.
+Supports two backends, selected with the XLSX_BACKEND environment variable:
+  openpyxl   - openpyxl write-only mode (default)
+  xlsxwriter - xlsxwriter, for fresh generation when it is installed
+"""
+
+import os
+from io import BytesIO
+
+import openpyxl
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
+from openpyxl.utils import get_column_letter
+
+HEADER_COLOR = '33A9DC'
+
+# Styles are built once and shared by every cell (openpyxl interns them per workbook)
+HEADER_FILL = PatternFill(start_color=HEADER_COLOR, end_color=HEADER_COLOR, fill_type='solid')
+HEADER_FONT = Font(bold=True, color='FFFFFF', size=11)
+HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='center')
+THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+
+def get_backend():
+    """Get the configured XLSX backend name."""
+    return os.getenv('XLSX_BACKEND', 'openpyxl').strip().lower()
+
+
+def _write_openpyxl(buffer, sheet_title, headers, rows, column_widths):
+    """Write a styled table with openpyxl in write-only mode."""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(sheet_title)
+
+    for col, width in enumerate(column_widths or [], 1):
+        ws.column_dimensions[get_column_letter(col)].width = width
+
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.fill = HEADER_FILL
+        cell.font = HEADER_FONT
+        cell.border = THIN_BORDER
+        cell.alignment = HEADER_ALIGNMENT
+        header_cells.append(cell)
+    ws.append(header_cells)
+
+    for row in rows:
+        row_cells = []
+        for value in row:
+            cell = WriteOnlyCell(ws, value=value)
+            cell.border = THIN_BORDER
+            row_cells.append(cell)
+        ws.append(row_cells)
+
+    wb.save(buffer)
+
+
+def _write_xlsxwriter(buffer, sheet_title, headers, rows, column_widths):
+    """Write a styled table with xlsxwriter."""
+    import xlsxwriter
+
+    wb = xlsxwriter.Workbook(buffer, {'in_memory': True})
+    ws = wb.add_worksheet(sheet_title)
+
+    header_format = wb.add_format({
+        'bold': True,
+        'font_color': '#FFFFFF',
+        'font_size': 11,
+        'bg_color': f'#{HEADER_COLOR}',
+        'border': 1,
+        'align': 'center',
+        'valign': 'vcenter'
+    })
+    cell_format = wb.add_format({'border': 1})
+
+    for col, width in enumerate(column_widths or []):
+        ws.set_column(col, col, width)
+
+    ws.write_row(0, 0, headers, header_format)
+    for row_num, row in enumerate(rows, 1):
+        ws.write_row(row_num, 0, row, cell_format)
+
+    wb.close()
+
+
+def write_table(sheet_title, headers, rows, column_widths=None):
+    """
+    Write a single-sheet workbook with a styled header row.
+
+    Args:
+        sheet_title: Worksheet name
+        headers: List of column headers
+        rows: Iterable of row value sequences
+        column_widths: Optional list of column widths, in column order
+
+    Returns:
+        BytesIO positioned at the start of the XLSX data
+    """
+    buffer = BytesIO()
+
+    if get_backend() == 'xlsxwriter':
+        try:
+            _write_xlsxwriter(buffer, sheet_title, headers, rows, column_widths)
+            buffer.seek(0)
+            return buffer
+        except ImportError:
+            print("[XLSX] xlsxwriter not installed, falling back to openpyxl")
+
+    _write_openpyxl(buffer, sheet_title, headers, rows, column_widths)
+    buffer.seek(0)
+    return buffer